@@ -0,0 +1,319 @@
+import collections
+import threading as th
+import pygame
+
+# Every image the game can show, preloaded once when the game starts
+GAME_IMAGES = [
+    'images/Start_screen.png', 'images/background.png', 'images/blank.png',
+    'images/Start.png', 'images/restart.png', 'images/hero1.png', 'images/hero2.png',
+    'images/full_heart.png', 'images/dead_heart.png', 'images/gold_heart.png',
+    'images/shield.png', 'images/bomb.png', 'images/delete_mark.png',
+    'images/cheese_brick.png', 'images/dirt_brick.png', 'images/sweet_brick.png',
+    'images/ice_cube.png',
+]
+
+# Images drawn scaled to the size of a board cell
+CELL_IMAGES = [
+    'images/bomb.png', 'images/gold_heart.png', 'images/shield.png',
+    'images/cheese_brick.png', 'images/dirt_brick.png', 'images/sweet_brick.png',
+    'images/ice_cube.png',
+]
+
+
+class AssetCache:
+    def __init__(self, max_scaled=256):
+        """
+        Initialize the image cache.
+
+        Source images are decoded once and kept for the whole process. Resized
+        variants are keyed by (path, size) and the least recently used ones are
+        evicted when there are more than max_scaled of them.
+
+        Args:
+            max_scaled: maximum number of resized surfaces to keep (default: 256)
+        """
+        self.max_scaled = max_scaled
+        self.sources = {}
+        self.scaled = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = th.Lock()
+
+    def load(self, path, size=None):
+        """
+        Return the image stored at path, optionally scaled to size.
+
+        Args:
+            path: path to the image file
+            size: (width, height) to scale the image to, or None for the original size
+
+        Returns:
+            pygame.Surface: shared surface, it must not be drawn on
+        """
+        if size is None:
+            return self.load_source(path)
+
+        key = (path, (int(size[0]), int(size[1])))
+        with self.lock:
+            surface = self.scaled.get(key)
+            if surface is not None:
+                self.scaled.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        surface = self.convert(pygame.transform.scale(self.load_source(path), key[1]))
+
+        with self.lock:
+            self.scaled[key] = surface
+            self.scaled.move_to_end(key)
+            while len(self.scaled) > self.max_scaled:
+                self.scaled.popitem(last=False)
+        return surface
+
+    def load_source(self, path):
+        """
+        Return the decoded image stored at path in its original size.
+
+        Args:
+            path: path to the image file
+
+        Returns:
+            pygame.Surface: shared surface, it must not be drawn on
+        """
+        with self.lock:
+            surface = self.sources.get(path)
+            if surface is not None:
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        # Decode outside the lock, the preloader thread may be loading other images meanwhile
+        surface = self.convert(pygame.image.load(path))
+        with self.lock:
+            self.sources.setdefault(path, surface)
+            return self.sources[path]
+
+    def preload(self, entries):
+        """
+        Load images ahead of time so later lookups are cache hits.
+
+        Args:
+            entries: image paths or (path, size) tuples
+        """
+        for entry in entries:
+            if isinstance(entry, tuple):
+                self.load(*entry)
+            else:
+                self.load_source(entry)
+
+    def convert(self, surface):
+        """
+        Convert the surface to the display pixel format when a display exists.
+
+        Args:
+            surface: surface to convert
+
+        Returns:
+            pygame.Surface: the converted surface, or the original one without a display
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha()
+
+    def clear(self):
+        """
+        Drop every cached surface and reset the counters.
+        """
+        with self.lock:
+            self.sources.clear()
+            self.scaled.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: hits, misses, and the number of source and resized surfaces
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sources': len(self.sources),
+            'scaled': len(self.scaled),
+        }
+
+
+# Process-wide image cache shared by all drawables
+images = AssetCache()
+
+
+class TextCache:
+    def __init__(self, max_size=512):
+        """
+        Initialize the text surface cache.
+
+        Rendered strings are keyed by (font, text, color, antialias) and the least
+        recently used ones are evicted when there are more than max_size of them.
+
+        Args:
+            max_size: maximum number of rendered strings to keep (default: 512)
+        """
+        self.max_size = max_size
+        self.surfaces = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = th.Lock()
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Return the rendered text, calling font.render only for unseen strings.
+
+        Args:
+            font: pygame font used to render the text
+            text: the string to render
+            color: color of the text
+            antialias: whether the text is antialiased (default: True)
+
+        Returns:
+            pygame.Surface: shared surface, it must not be drawn on
+        """
+        key = (font, text, tuple(color), antialias)
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        surface = font.render(text, antialias, color)
+
+        with self.lock:
+            self.surfaces[key] = surface
+            while len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Drop every cached surface and reset the counters.
+        """
+        with self.lock:
+            self.surfaces.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: hits, misses, and the number of cached strings
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.surfaces)}
+
+
+# Process-wide cache of rendered strings shared by all text drawables
+texts = TextCache()
+
+
+class FontCache:
+    def __init__(self):
+        """
+        Initialize the font cache.
+
+        Fonts are keyed by (name, size) and shared by every text drawable using
+        them. The first system font lookup scans the installed fonts, which can
+        take a long time, so fonts are only created when text is first drawn.
+        """
+        self.fonts = {}
+        self.lock = th.Lock()
+
+    def load(self, name, size):
+        """
+        Return the font with the given name and size.
+
+        Args:
+            name: system font name, or None for pygame's default font
+            size: font size in pixels
+
+        Returns:
+            pygame.font.Font: shared font
+        """
+        key = (name, int(size))
+        with self.lock:
+            font = self.fonts.get(key)
+        if font is not None:
+            return font
+
+        font = pygame.font.Font(None, key[1]) if name is None else pygame.font.SysFont(name, key[1])
+        with self.lock:
+            return self.fonts.setdefault(key, font)
+
+    def warm(self):
+        """
+        Scan the installed system fonts so the first SysFont lookup does not have to.
+        """
+        pygame.font.get_fonts()
+
+    def clear(self):
+        """
+        Drop every cached font.
+        """
+        with self.lock:
+            self.fonts.clear()
+
+
+# Process-wide font cache shared by all text drawables
+fonts = FontCache()
+
+
+class Preloader:
+    def __init__(self, entries):
+        """
+        Initialize a loader filling the image and font caches in a background thread.
+
+        The game starts it while the start screen is shown, so the images of
+        the match are decoded and scaled, and the system fonts scanned, while
+        the players type their names.
+
+        Args:
+            entries: image paths or (path, size) tuples to load
+        """
+        self.entries = entries
+        self.error = None
+        self.thread = th.Thread(target=self.run, name='preloader', daemon=True)
+
+    def start(self):
+        """
+        Start loading in the background.
+
+        Returns:
+            Preloader: the started preloader
+        """
+        self.thread.start()
+        return self
+
+    def run(self):
+        """
+        Load the images and scan the fonts, keeping the error to raise it in wait.
+        """
+        try:
+            images.preload(self.entries)
+            fonts.warm()
+        except Exception as error:
+            self.error = error
+
+    def wait(self):
+        """
+        Block until loading has finished.
+
+        Raises:
+            Exception: the error raised while loading, if any
+        """
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
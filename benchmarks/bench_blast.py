@@ -0,0 +1,79 @@
+"""
+Benchmark explosion resolution with hundreds of bombs going off in the same tick.
+
+Run from the repository root: python benchmarks/bench_blast.py
+"""
+import random
+import time
+from common import load_game
+
+
+def setup_board(Game, bombs):
+    """
+    Create a game whose board is filled with bombs that explode on the next tick and cubes.
+
+    Args:
+        Game: Game class
+        bombs: number of bombs to place
+
+    Returns:
+        Game: the prepared game
+    """
+    import drawable as dr
+    from grid import BOMB, CUBE
+    game = Game(1200, 600, 110, seed=bombs)
+    # Heroes caught in blasts must not end the game
+    game.hero1.lives = game.hero2.lives = 10 ** 6
+    rows = game.world.rows
+    columns = game.world.columns
+    geometry = game.board.geometry
+    cells = [(i, j) for i in range(rows) for j in range(columns)]
+    random.Random(bombs).shuffle(cells)
+    for number, (i, j) in enumerate(cells):
+        x, y = geometry.origin(i, j)
+        if number < bombs:
+            bomb = dr.Bomb(game.board, 'images/bomb.png', player=1, i=i, j=j, timer=0,
+                           width=geometry.cell_width, height=geometry.cell_height)
+            game.world.bombs.add(bomb)
+            game.world.grid.set(i, j, BOMB)
+        else:
+            cube = dr.Cube(x, y, geometry.cell_width, geometry.cell_height, i=i, j=j)
+            game.world.cubes.add(cube)
+            game.world.grid.set(i, j, CUBE)
+    return game
+
+
+def run(namespace):
+    """
+    Time one bomb_collision call with a growing number of bombs exploding at once.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: one result per bomb count, with the best of 5 runs
+    """
+    Game = namespace['Game']
+    results = []
+    for bombs in (1, 50, 100, 200, 300):
+        timings = []
+        for _ in range(5):
+            game = setup_board(Game, bombs)
+            cubes = len(game.world.cubes)
+            start = time.perf_counter()
+            game.bomb_collision()
+            timings.append(time.perf_counter() - start)
+            assert not game.world.bombs
+        best = min(timings)
+        results.append({'bombs': bombs, 'cubes': cubes, 'ops_per_sec': 1 / best, 'best_us': best * 1e6})
+    return results
+
+
+def main():
+    print(f"{'bombs':>6} {'cubes':>6} {'ms per tick':>12}")
+    for result in run(load_game()):
+        print(f"{result['bombs']:>6} {result['cubes']:>6} {result['best_us'] / 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
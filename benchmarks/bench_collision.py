@@ -0,0 +1,65 @@
+"""
+Benchmark hero/cube collision checks on a board filled with a growing number of cubes,
+up to every cell of the 16x20 board that is not next to a hero.
+
+Run from the repository root: python benchmarks/bench_collision.py
+"""
+import random
+from common import load_game, measure
+
+
+def fill_board(game, count):
+    """
+    Place count cubes on random free cells, the same way spawn_cubes lays them out.
+
+    Args:
+        game: Game instance
+        count: number of cubes to place
+    """
+    import drawable as dr
+    rows = game.world.rows
+    columns = game.world.columns
+    # Keep the heroes free so every check scans the whole neighborhood without an early hit
+    heroes = [(hero.get_position_i(), hero.get_position_j()) for hero in (game.hero1, game.hero2)]
+    cells = [(i, j) for i in range(rows) for j in range(columns)
+             if all(abs(i - hi) > 1 or abs(j - hj) > 1 for hi, hj in heroes)]
+    random.Random(count).shuffle(cells)
+    geometry = game.board.geometry
+    for i, j in cells[:count]:
+        x, y = geometry.origin(i, j)
+        cube = dr.Cube(x, y, geometry.cell_width, geometry.cell_height, i=i, j=j)
+        game.world.cubes.add(cube)
+
+
+def run(namespace):
+    """
+    Time the indexed check against a linear scan for growing cube counts.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: one result per cube count, with the indexed and linear timings
+    """
+    check_collision = namespace['check_collision']
+    results = []
+    for count in (0, 40, 80, 160, 240, 308):
+        game = namespace['Game'](1200, 600, 110, seed=count)
+        fill_board(game, count)
+        hero = game.hero1
+
+        indexed = measure(lambda: check_collision(hero, game.world.cube_index))
+        linear = measure(lambda: any(hero.rect.colliderect(cube.rect) for cube in game.world.cubes))
+        results.append({'cubes': count, **indexed, 'linear_ops_per_sec': linear['ops_per_sec'],
+                        'linear_mean_us': linear['mean_us']})
+    return results
+
+
+def main():
+    print(f"{'cubes':>6} {'indexed us':>11} {'linear us':>10}")
+    for result in run(load_game()):
+        print(f"{result['cubes']:>6} {result['mean_us']:>11.2f} {result['linear_mean_us']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark Board.draw with every allowed cell of the board covered by a cube.
+
+Run from the repository root: python benchmarks/bench_draw.py
+"""
+from common import load_game, measure
+
+
+def full_board(Game):
+    """
+    Create a game with a board filled to capacity and drawn once.
+
+    Args:
+        Game: Game class
+
+    Returns:
+        Game: the prepared game
+    """
+    game = Game(1200, 600, 110, seed=0)
+    game.spawn_cubes(game.world.rows * game.world.columns)
+    game.render(0)
+    return game
+
+
+def run(namespace):
+    """
+    Time drawing a full board when nothing changed, when a hero moves, when a cube
+    is destroyed and respawned, and when everything is repainted.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: one result per scenario
+    """
+    game = full_board(namespace['Game'])
+    board = game.board
+    layers = game.layers
+    hero = game.hero2
+    steps = iter(range(10 ** 9))
+
+    def move_hero():
+        # Walk one pixel back and forth so the hero's region is dirty every call
+        hero.draw_rect.x += 1 if next(steps) % 2 else -1
+        board.draw(*layers)
+
+    cubes = game.world.cubes
+    cube = next(iter(cubes))
+
+    def cube_changes():
+        # Destroy a cube on one call and spawn it back on the next
+        if cube in cubes:
+            cubes.remove(cube)
+        else:
+            cubes.add(cube)
+        board.draw(*layers)
+
+    def full_redraw():
+        board.invalidate()
+        board.draw(*layers)
+
+    results = []
+    for scenario, function, number in (('unchanged', lambda: board.draw(*layers), 2000),
+                                       ('hero_moving', move_hero, 2000),
+                                       ('cube_changes', cube_changes, 2000),
+                                       ('full_redraw', full_redraw, 200)):
+        results.append({'scenario': scenario, 'objects': sum(len(layer) for layer in layers),
+                        **measure(function, number)})
+    return results
+
+
+def main():
+    print(f"{'scenario':>12} {'objects':>8} {'us per draw':>12} {'draws/s':>9}")
+    for result in run(load_game()):
+        print(f"{result['scenario']:>12} {result['objects']:>8} {result['mean_us']:>12.1f} "
+              f"{result['ops_per_sec']:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
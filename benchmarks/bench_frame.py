@@ -0,0 +1,89 @@
+"""
+Benchmark whole frames of a match played by random controllers, rendered and headless.
+
+Run from the repository root: python benchmarks/bench_frame.py
+"""
+import time
+from common import load_game
+
+
+def play_frames(game, frames, fps=60):
+    """
+    Run frames the way Game.run does, without the frame limiter.
+
+    Args:
+        game: prepared Game instance
+        frames: number of frames to run
+        fps: frame rate the ticks are paced for (default: 60)
+
+    Returns:
+        float: elapsed time in seconds
+    """
+    lag = 0.0
+    start = time.perf_counter()
+    for _ in range(frames):
+        lag += 1 / fps
+        while lag >= game.tick_length:
+            game.update()
+            lag -= game.tick_length
+        game.render(lag / game.tick_length)
+    return time.perf_counter() - start
+
+
+def create_game(namespace, seed, headless):
+    """
+    Create a prepared game whose heroes cannot die, so every frame is mid-match.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        seed: seed of the world and the controllers
+        headless: run without rendering
+
+    Returns:
+        Game: the prepared game
+    """
+    from controls import RandomController
+    controllers = (RandomController(seed * 2 + 1), RandomController(seed * 2 + 2))
+    game = namespace['Game'](1200, 600, 110, headless=headless, controllers=controllers, seed=seed)
+    game.hero1.lives = game.hero2.lives = 10 ** 6
+    game.prepare()
+    return game
+
+
+def run(namespace):
+    """
+    Time 1000 rendered frames and 10000 headless ticks.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: frame throughput with rendering, and tick throughput without it
+    """
+    game = create_game(namespace, 1, headless=False)
+    frames = 1000
+    elapsed = play_frames(game, frames)
+    results = [{'mode': 'rendered', 'frames': frames, 'ticks': game.ticks, 'ops_per_sec': frames / elapsed,
+                'mean_us': elapsed / frames * 1e6}]
+
+    game = create_game(namespace, 1, headless=True)
+    ticks = 10000
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+    elapsed = time.perf_counter() - start
+    results.append({'mode': 'headless', 'frames': 0, 'ticks': ticks, 'ops_per_sec': ticks / elapsed,
+                    'mean_us': elapsed / ticks * 1e6})
+    return results
+
+
+def main():
+    print(f"{'mode':>9} {'ticks':>6} {'per second':>11} {'us each':>8}")
+    for result in run(load_game()):
+        unit = 'frames' if result['frames'] else 'ticks'
+        print(f"{result['mode']:>9} {result['ticks']:>6} {result['ops_per_sec']:>11.0f} {result['mean_us']:>8.1f}"
+              f" ({unit})")
+
+
+if __name__ == '__main__':
+    main()
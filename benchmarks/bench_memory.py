@@ -0,0 +1,130 @@
+"""
+Benchmark the memory and construction time of the entities filling every cell of the board,
+comparing the slotted entities sharing cached images with entities owning a surface each.
+
+Run from the repository root: python benchmarks/bench_memory.py
+"""
+import time
+import tracemalloc
+from common import load_game
+
+
+def owned_surface_class():
+    """
+    Create a class representing entities the way they were stored before, each one
+    owning a surface with its image blitted in, plus a per-instance dict.
+
+    Returns:
+        type: the class, constructed like the slotted entities from an image and a cell
+    """
+    from drawable import Drawable
+
+    class OwnedSurface(Drawable):
+        def __init__(self, image, x, y, i, j):
+            super().__init__(image.get_width(), image.get_height(), x, y)
+            self.image = image
+            self.surface.blit(image, (0, 0))
+            self.i = i
+            self.j = j
+
+    return OwnedSurface
+
+
+def measure_entities(create, cells):
+    """
+    Create one entity per cell while tracing allocations.
+
+    Args:
+        create: function (i, j) -> entity
+        cells: (i, j) cells to fill
+
+    Returns:
+        tuple: the entities, traced KiB still allocated, and seconds taken
+    """
+    # run_all may already be tracing the whole benchmark, only stop tracing if started here
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    entities = [create(i, j) for i, j in cells]
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    if not tracing:
+        tracemalloc.stop()
+    return entities, allocated / 1024, elapsed
+
+
+def surface_kib(entities):
+    """
+    Sum the pixel memory of the surfaces owned by entities, which tracemalloc does not see.
+
+    Args:
+        entities: created entities
+
+    Returns:
+        float: pixel memory in KiB, 0 for entities that only reference shared images
+    """
+    total = 0
+    for entity in entities:
+        surface = getattr(entity, 'surface', None)
+        if surface is not None:
+            total += surface.get_width() * surface.get_height() * surface.get_bytesize()
+    return total / 1024
+
+
+def run(namespace):
+    """
+    Fill every cell of the board with each kind of grid entity, in both representations.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: one result per entity kind and representation
+    """
+    import random
+    import drawable as dr
+    game = namespace['Game'](1200, 600, 110, seed=0)
+    geometry = game.board.geometry
+    board = game.board
+    size = (geometry.cell_width, geometry.cell_height)
+    cells = [(i, j) for i in range(game.world.rows) for j in range(game.world.columns)]
+    OwnedSurface = owned_surface_class()
+    rng = random.Random(0)
+
+    kinds = {
+        'cube': lambda i, j: dr.Cube(*geometry.origin(i, j), *size, i=i, j=j, rng=rng),
+        'bomb': lambda i, j: dr.Bomb(board, 'images/bomb.png', 1, i, j, width=size[0], height=size[1]),
+        'item': lambda i, j: dr.Item(board, 1, *size, i=i, j=j),
+        'delete': lambda i, j: dr.Delete(geometry, i, j),
+    }
+    results = []
+    for kind, create in kinds.items():
+        # Warm the image cache so both representations start from loaded images
+        create(0, 0)
+        for representation, factory in (('slotted', create),
+                                        ('owned_surface', lambda i, j: OwnedSurface(create(i, j).image,
+                                                                                     *geometry.origin(i, j), i, j))):
+            entities, python_kib, elapsed = measure_entities(factory, cells)
+            results.append({
+                'entity': kind,
+                'representation': representation,
+                'count': len(entities),
+                'python_kib': python_kib,
+                'surface_kib': surface_kib(entities),
+                'ops_per_sec': len(entities) / elapsed,
+                'mean_us': elapsed / len(entities) * 1e6,
+            })
+    return results
+
+
+def main():
+    print(f"{'entity':>7} {'representation':>15} {'count':>6} {'python KiB':>11} {'surface KiB':>12} {'us each':>8}")
+    for result in run(load_game()):
+        print(f"{result['entity']:>7} {result['representation']:>15} {result['count']:>6} "
+              f"{result['python_kib']:>11.1f} {result['surface_kib']:>12.1f} {result['mean_us']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
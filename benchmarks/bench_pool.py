@@ -0,0 +1,74 @@
+"""
+Benchmark a long match with the entity pools recycling bombs, cubes, items and delete marks,
+against the same match with pools that keep nothing, so every spawn allocates a new entity.
+
+Run from the repository root: python benchmarks/bench_pool.py
+"""
+import gc
+import time
+from common import load_game
+
+
+def play(namespace, max_free, ticks, seed=1):
+    """
+    Play a long headless match whose heroes cannot die.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        max_free: free list size of every pool, 0 disables recycling
+        ticks: number of ticks to play
+        seed: seed of the world and the controllers (default: 1)
+
+    Returns:
+        dict: throughput, garbage collections and pool counters summed over the entity types
+    """
+    from controls import RandomController
+    controllers = (RandomController(seed * 2 + 1), RandomController(seed * 2 + 2))
+    game = namespace['Game'](1200, 600, 10 ** 6, headless=True, controllers=controllers, seed=seed)
+    game.hero1.lives = game.hero2.lives = 10 ** 6
+    world = game.world
+    for pool in (world.cube_pool, world.bomb_pool, world.item_pool, world.mark_pool):
+        pool.max_free = max_free
+    game.prepare()
+
+    collections = sum(generation['collections'] for generation in gc.get_stats())
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+    elapsed = time.perf_counter() - start
+    collections = sum(generation['collections'] for generation in gc.get_stats()) - collections
+
+    pools = world.pool_stats().values()
+    return {
+        'ticks': ticks,
+        'ops_per_sec': ticks / elapsed,
+        'gc_collections': collections,
+        'created': sum(pool['created'] for pool in pools),
+        'reused': sum(pool['reused'] for pool in pools),
+        'explosions': world.explosions,
+    }
+
+
+def run(namespace, ticks=30000):
+    """
+    Play the same long match without and with recycling.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        ticks: number of ticks per match (default: 30000, five minutes of game time)
+
+    Returns:
+        list: one result per pool mode
+    """
+    return [{'pools': mode, **play(namespace, max_free, ticks)} for mode, max_free in (('off', 0), ('on', 512))]
+
+
+def main():
+    print(f"{'pools':>5} {'ticks':>6} {'ticks/s':>8} {'gc runs':>8} {'created':>8} {'reused':>7} {'blasts':>7}")
+    for result in run(load_game()):
+        print(f"{result['pools']:>5} {result['ticks']:>6} {result['ops_per_sec']:>8.0f} {result['gc_collections']:>8} "
+              f"{result['created']:>8} {result['reused']:>7} {result['explosions']:>7}")
+
+
+if __name__ == '__main__':
+    main()
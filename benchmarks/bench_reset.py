@@ -0,0 +1,103 @@
+"""
+Benchmark restarting a match: resetting the game in place against re-running Game.__init__,
+which is how the restart button used to start a new match.
+
+Every restart follows a short match, so the board holds cubes and bombs, goes through the start
+screen like the game does, and is timed up to the first frame of the new match being drawn.
+
+Run from the repository root: python benchmarks/bench_reset.py
+"""
+import time
+import pygame
+from common import load_game
+
+
+def reinitialize(game):
+    """
+    Restart the way the game did before resetting in place.
+
+    Args:
+        game: Game instance after a match
+    """
+    game.scheduler.clear()
+    game.__init__(game.width, game.height, game.game_time, game.tick_rate, game.fps, game.headless,
+                  game.controllers, game.seed)
+
+
+def click_start(game):
+    """
+    Show the start screen and click its start button, like the players do before every match.
+
+    Args:
+        game: Game instance
+    """
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=game.start_button.rect.center))
+    game.start_screen()
+
+
+def restart_latencies(game, restart, resets, ticks=100):
+    """
+    Play short matches and time every restart up to the first frame after it.
+
+    Args:
+        game: Game instance, not prepared yet
+        restart: function restarting the game
+        resets: number of restarts
+        ticks: number of ticks played before each restart (default: 100)
+
+    Returns:
+        list: sorted restart times in seconds
+    """
+    latencies = []
+    game.prepare()
+    for _ in range(resets):
+        for _ in range(ticks):
+            game.update()
+        start = time.perf_counter()
+        restart(game)
+        click_start(game)
+        game.prepare()
+        game.render(0)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def run(namespace, resets=200):
+    """
+    Restart matches repeatedly, headless and rendered, in place and by re-initializing.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        resets: number of restarts per mode (default: 200)
+
+    Returns:
+        list: one result per window mode and restart method
+    """
+    from profiler import percentile
+    Game = namespace['Game']
+    results = []
+    # Rendered first, images cached while no display exists are not converted to its pixel format
+    for headless in (False, True):
+        for method, restart in (('reinit', reinitialize), ('in_place', Game.reset_game)):
+            game = Game(1200, 600, 110, headless=headless, seed=1)
+            latencies = restart_latencies(game, restart, resets)
+            results.append({
+                'mode': 'headless' if headless else 'rendered',
+                'method': method,
+                'resets': resets,
+                'ops_per_sec': resets / sum(latencies),
+                'p50_us': percentile(latencies, 0.5) * 1e6,
+                'p95_us': percentile(latencies, 0.95) * 1e6,
+            })
+    return results
+
+
+def main():
+    print(f"{'mode':>9} {'method':>9} {'resets':>7} {'p50 us':>9} {'p95 us':>9} {'resets/s':>9}")
+    for result in run(load_game()):
+        print(f"{result['mode']:>9} {result['method']:>9} {result['resets']:>7} {result['p50_us']:>9.0f} "
+              f"{result['p95_us']:>9.0f} {result['ops_per_sec']:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
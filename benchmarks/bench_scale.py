@@ -0,0 +1,105 @@
+"""
+Benchmark boards of growing size: setting up a match, frames, spawning cubes and
+repainting after a blast, which should not get slower with the number of cells.
+
+Run from the repository root: python benchmarks/bench_scale.py
+"""
+import time
+from common import load_game
+from bench_frame import play_frames
+
+# Board sizes as (rows, columns)
+SIZES = [(16, 20), (64, 64), (128, 128), (256, 256)]
+
+
+def create_game(namespace, rows, columns, seed=1):
+    """
+    Create a rendered game whose heroes cannot die and time filling its board with cubes.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        rows: number of rows of the board
+        columns: number of columns of the board
+        seed: seed of the world and the controllers (default: 1)
+
+    Returns:
+        tuple: the prepared game and the seconds taken to create and prepare it
+    """
+    from controls import RandomController
+    controllers = (RandomController(seed * 2 + 1), RandomController(seed * 2 + 2))
+    start = time.perf_counter()
+    game = namespace['Game'](1200, 600, 10 ** 6, controllers=controllers, seed=seed, rows=rows, columns=columns)
+    game.prepare()
+    setup = time.perf_counter() - start
+    game.hero1.lives = game.hero2.lives = 10 ** 6
+    game.render(0)
+    return game, setup
+
+
+def blast_redraw(game, cubes=5):
+    """
+    Destroy a few cubes like a blast does and time the frame repainting them.
+
+    Args:
+        game: prepared Game instance
+        cubes: number of cubes to destroy (default: 5)
+
+    Returns:
+        float: seconds taken by the render
+    """
+    world = game.world
+    destroyed = list(world.cubes)[:cubes]
+    for cube in destroyed:
+        world.grid.clear(cube.i, cube.j)
+        world.cubes.remove(cube)
+    world.cube_pool.release_all(destroyed)
+    start = time.perf_counter()
+    game.render(0)
+    return time.perf_counter() - start
+
+
+def run(namespace, frames=300, spawns=100, blasts=20):
+    """
+    Time every board size.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        frames: number of frames played per size (default: 300)
+        spawns: number of single cube spawns timed per size (default: 100)
+        blasts: number of blast repaints timed per size (default: 20)
+
+    Returns:
+        list: one result per board size, ops_per_sec being frames per second
+    """
+    results = []
+    for rows, columns in SIZES:
+        game, setup = create_game(namespace, rows, columns)
+        elapsed = play_frames(game, frames)
+
+        start = time.perf_counter()
+        for _ in range(spawns):
+            game.spawn_cubes(1)
+        spawn = (time.perf_counter() - start) / spawns
+
+        blast = sum(blast_redraw(game) for _ in range(blasts)) / blasts
+        results.append({
+            'board': f'{rows}x{columns}',
+            'cubes': len(game.world.cubes),
+            'setup_ms': setup * 1000,
+            'ops_per_sec': frames / elapsed,
+            'frame_us': elapsed / frames * 1e6,
+            'spawn_us': spawn * 1e6,
+            'blast_redraw_us': blast * 1e6,
+        })
+    return results
+
+
+def main():
+    print(f"{'board':>8} {'cubes':>6} {'setup ms':>9} {'frame us':>9} {'spawn us':>9} {'blast us':>9}")
+    for result in run(load_game()):
+        print(f"{result['board']:>8} {result['cubes']:>6} {result['setup_ms']:>9.0f} {result['frame_us']:>9.0f} "
+              f"{result['spawn_us']:>9.1f} {result['blast_redraw_us']:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
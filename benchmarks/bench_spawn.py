@@ -0,0 +1,68 @@
+"""
+Benchmark spawn_cubes placing one cube at a time until no allowed cell is left.
+
+Run from the repository root: python benchmarks/bench_spawn.py
+"""
+import time
+from common import load_game
+
+
+def fill(game):
+    """
+    Spawn cubes one by one until a call places nothing.
+
+    Args:
+        game: Game instance with an empty board
+
+    Returns:
+        list: duration in seconds of every call, the last one found the board full
+    """
+    timings = []
+    while True:
+        cubes = len(game.world.cubes)
+        start = time.perf_counter()
+        game.spawn_cubes(1)
+        timings.append(time.perf_counter() - start)
+        if len(game.world.cubes) == cubes:
+            return timings
+
+
+def run(namespace):
+    """
+    Time filling the board to capacity, cube by cube.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        list: one result per seed, with the per-cube latency percentiles and the latency on a full board
+    """
+    from profiler import percentile
+    results = []
+    for seed in range(3):
+        game = namespace['Game'](1200, 600, 110, seed=seed)
+        timings = fill(game)
+        placed = sorted(timings[:-1])
+        total = sum(placed)
+        results.append({
+            'seed': seed,
+            'cubes': len(placed),
+            'ops_per_sec': len(placed) / total,
+            'fill_ms': total * 1000,
+            'p50_us': percentile(placed, 0.5) * 1e6,
+            'p99_us': percentile(placed, 0.99) * 1e6,
+            'max_us': placed[-1] * 1e6,
+            'full_board_us': timings[-1] * 1e6,
+        })
+    return results
+
+
+def main():
+    print(f"{'seed':>4} {'cubes':>6} {'fill ms':>8} {'p50 us':>7} {'p99 us':>7} {'max us':>7} {'full us':>8}")
+    for result in run(load_game()):
+        print(f"{result['seed']:>4} {result['cubes']:>6} {result['fill_ms']:>8.2f} {result['p50_us']:>7.1f} "
+              f"{result['p99_us']:>7.1f} {result['max_us']:>7.1f} {result['full_board_us']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
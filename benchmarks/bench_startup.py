@@ -0,0 +1,81 @@
+"""
+Benchmark the startup of the game: importing main.py, creating the game and drawing the start screen,
+with the match assets loaded up front and with fast_start loading them in the background.
+
+Each measurement runs in a fresh interpreter so imports and caches start cold.
+
+Run from the repository root: python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from common import ROOT, setup
+
+# Timings taken inside the child interpreter, in seconds since its first statement
+STARTUP = '''
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+game = main.Game(1200, 600, 110, fast_start=sys.argv[1] == 'fast_start')
+created = time.perf_counter()
+game.board.invalidate()
+game.board.draw(game.start_elements)
+first_frame = time.perf_counter()
+game.create_match()
+ready = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create': created - imported,
+                  'first_frame': first_frame - start, 'match_ready': ready - start}))
+'''
+
+
+def start_once(mode):
+    """
+    Start the game in a new interpreter and time its startup phases.
+
+    Args:
+        mode: 'fast_start', or 'eager' to load every asset before the start screen
+
+    Returns:
+        dict: import, create, first_frame and match_ready times plus the process wall time, in milliseconds
+    """
+    start = time.perf_counter()
+    child = subprocess.run([sys.executable, '-c', STARTUP, mode], cwd=ROOT, env=os.environ,
+                           capture_output=True, text=True, check=True)
+    process = time.perf_counter() - start
+    timings = json.loads(child.stdout.strip().splitlines()[-1])
+    timings['process'] = process
+    return {phase: seconds * 1000 for phase, seconds in timings.items()}
+
+
+def run(namespace, repeat=5):
+    """
+    Start the game repeatedly in both modes and keep the median of every phase.
+
+    Args:
+        namespace: globals of main.py returned by load_game, unused as every start needs a fresh interpreter
+        repeat: number of starts per mode (default: 5)
+
+    Returns:
+        list: one result per mode, ops_per_sec being starts per second up to the first frame
+    """
+    setup()
+    results = []
+    for mode in ('eager', 'fast_start'):
+        runs = [start_once(mode) for _ in range(repeat)]
+        medians = {f'{phase}_ms': sorted(run[phase] for run in runs)[repeat // 2] for phase in runs[0]}
+        results.append({'mode': mode, **medians, 'ops_per_sec': 1000 / medians['first_frame_ms']})
+    return results
+
+
+def main():
+    print(f"{'mode':>11} {'import':>8} {'create':>8} {'1st frame':>10} {'match':>8} {'process':>8}  (ms)")
+    for result in run(None):
+        print(f"{result['mode']:>11} {result['import_ms']:>8.1f} {result['create_ms']:>8.1f} "
+              f"{result['first_frame_ms']:>10.1f} {result['match_ready_ms']:>8.1f} {result['process_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
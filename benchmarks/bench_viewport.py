@@ -0,0 +1,118 @@
+"""
+Benchmark drawing boards larger than the view while the camera scrolls, with the
+entities in view taken from the grid indexes against blitting every entity.
+
+Run from the repository root: python benchmarks/bench_viewport.py
+"""
+import time
+import pygame
+from common import load_game
+
+# Board sizes as (rows, columns), shown 16 rows and 20 columns at a time
+SIZES = [(32, 40), (64, 64), (128, 128), (256, 256)]
+VIEW = (16, 20)
+
+
+def create_game(namespace, rows, columns, seed=1):
+    """
+    Create a rendered game on a scrolling board, filled with cubes.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        rows: number of rows of the board
+        columns: number of columns of the board
+        seed: seed of the world (default: 1)
+
+    Returns:
+        Game: the prepared game, drawn once
+    """
+    game = namespace['Game'](1200, 600, 10 ** 6, seed=seed, rows=rows, columns=columns, view_rows=VIEW[0],
+                             view_columns=VIEW[1])
+    game.prepare()
+    game.render(0)
+    return game
+
+
+def scroll_culled(game, frames):
+    """
+    Time frames drawn by the board while the camera moves one pixel per frame.
+
+    Args:
+        game: prepared Game instance on a scrolling board
+        frames: number of frames to draw
+
+    Returns:
+        float: elapsed time in seconds
+    """
+    camera = game.board.camera
+    start = time.perf_counter()
+    for frame in range(frames):
+        camera.move_to(frame, frame)
+        game.board.draw(*game.layers)
+    return time.perf_counter() - start
+
+
+def scroll_everything(game, frames):
+    """
+    Time the same frames drawn by blitting every entity of the board, moved by the camera and clipped to the field.
+
+    Args:
+        game: prepared Game instance on a scrolling board
+        frames: number of frames to draw
+
+    Returns:
+        float: elapsed time in seconds
+    """
+    board = game.board
+    camera = board.camera
+    surface = board.surface
+    layers = [game.world.cubes, game.layers[1], game.world.items, game.world.bombs, game.world.marks]
+    start = time.perf_counter()
+    for frame in range(frames):
+        camera.move_to(frame, frame)
+        dx, dy = -camera.x, -camera.y
+        surface.blit(game.background.image, (0, 0))
+        surface.set_clip(camera.field)
+        for layer in layers:
+            surface.blits([(obj.image, board.drawn_rect(obj).move(dx, dy)) for obj in layer], False)
+        surface.set_clip(None)
+        surface.blits([(obj.image, obj.rect) for obj in game.layers[-1]], False)
+        pygame.display.update()
+    return time.perf_counter() - start
+
+
+def run(namespace, frames=100):
+    """
+    Time scrolling over every board size.
+
+    Args:
+        namespace: globals of main.py returned by load_game
+        frames: number of scrolling frames per size and mode (default: 100)
+
+    Returns:
+        list: one result per board size and mode, ops_per_sec being frames per second
+    """
+    results = []
+    for rows, columns in SIZES:
+        game = create_game(namespace, rows, columns)
+        for mode, scroll in (('culled', scroll_culled), ('everything', scroll_everything)):
+            elapsed = scroll(game, frames)
+            results.append({
+                'board': f'{rows}x{columns}',
+                'mode': mode,
+                'cubes': len(game.world.cubes),
+                'ops_per_sec': frames / elapsed,
+                'frame_us': elapsed / frames * 1e6,
+            })
+    return results
+
+
+def main():
+    print(f"{'board':>8} {'mode':>10} {'cubes':>6} {'frames/s':>9} {'frame us':>9}")
+    for result in run(load_game()):
+        print(f"{result['board']:>8} {result['mode']:>10} {result['cubes']:>6} {result['ops_per_sec']:>9.0f} "
+              f"{result['frame_us']:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
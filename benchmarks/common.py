@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import runpy
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    """
+    Prepare a headless pygame environment rooted at the repository.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+def load_game():
+    """
+    Load main.py the same way `python main.py` does.
+
+    Returns:
+        dict: globals of the executed main.py, including the Game class
+    """
+    setup()
+    return runpy.run_path(os.path.join(ROOT, 'main.py'), run_name='benchmark')
+
+
+def measure(function, number=10000):
+    """
+    Call a function repeatedly and measure its throughput.
+
+    Args:
+        function: callable without arguments
+        number: number of calls (default: 10000)
+
+    Returns:
+        dict: operations per second and mean time per call in microseconds
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    elapsed = time.perf_counter() - start
+    return {'ops_per_sec': number / elapsed, 'mean_us': elapsed / number * 1e6}
+
+
+def measure_memory(function):
+    """
+    Call a function once while tracing Python allocations.
+
+    Args:
+        function: callable without arguments
+
+    Returns:
+        dict: peak and retained allocations in KiB
+    """
+    tracemalloc.start()
+    try:
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_kib': peak / 1024, 'retained_kib': current / 1024}
@@ -0,0 +1,105 @@
+"""
+Run every benchmark and save the results as JSON for comparing commits.
+
+Run from the repository root:
+    python benchmarks/run_all.py --output results/HEAD.json
+    python benchmarks/run_all.py --output results/new.json --compare results/HEAD.json
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import time
+from common import ROOT, load_game, measure_memory
+
+BENCHMARKS = ['bench_collision', 'bench_blast', 'bench_spawn', 'bench_draw', 'bench_frame', 'bench_memory',
+              'bench_startup', 'bench_reset', 'bench_pool', 'bench_scale',
+              'bench_viewport']
+
+
+def commit():
+    """
+    Get the commit the benchmarks run on.
+
+    Returns:
+        str: abbreviated commit hash, with '-dirty' for uncommitted changes, or None outside git
+    """
+    try:
+        revision = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True,
+                                  text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision.stdout.strip()
+
+
+def run_benchmark(name, namespace):
+    """
+    Run one benchmark, then run it again under tracemalloc to measure its memory.
+
+    Args:
+        name: module name in BENCHMARKS
+        namespace: globals of main.py returned by load_game
+
+    Returns:
+        dict: results, wall time in seconds, and peak and retained allocations in KiB
+    """
+    module = importlib.import_module(name)
+    start = time.perf_counter()
+    results = module.run(namespace)
+    seconds = time.perf_counter() - start
+    memory = measure_memory(lambda: module.run(namespace))
+    return {'results': results, 'seconds': seconds, **memory}
+
+
+def compare(report, baseline):
+    """
+    Print the throughput change of every result against a previous report.
+
+    Args:
+        report: report of this run
+        baseline: report loaded from a previous run
+    """
+    print(f"\ncompared with {baseline.get('commit')}:")
+    for name, benchmark in report['benchmarks'].items():
+        previous = baseline['benchmarks'].get(name)
+        if previous is None:
+            continue
+        for result, old in zip(benchmark['results'], previous['results']):
+            label = ' '.join(f"{key}={value}" for key, value in result.items() if not isinstance(value, float))
+            change = result['ops_per_sec'] / old['ops_per_sec'] - 1
+            print(f"  {name:<16} {label:<32} {change:>+8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Kaboom Combat benchmark suite.')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='run only these benchmarks')
+    args = parser.parse_args()
+
+    namespace = load_game()
+    import pygame
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'benchmarks': {},
+    }
+    for name in args.only or BENCHMARKS:
+        benchmark = run_benchmark(name, namespace)
+        report['benchmarks'][name] = benchmark
+        print(f"{name:<16} {benchmark['seconds']:>7.2f} s  peak {benchmark['peak_kib']:>9.1f} KiB  "
+              f"retained {benchmark['retained_kib']:>9.1f} KiB")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,16 @@
 import pygame
-import pygame.locals
-from drawable import *
-import sys
+from assets import images
+from camera import Camera
+from grid import GridGeometry
+from layer import Layer
+
+# Number of regions a layer may change in one frame, above it the whole window is repainted
+MAX_LAYER_CHANGES = 64
 
 
 class Board:
-    def __init__(self, width, height, background=None):
+    def __init__(self, width, height, background=None, dirty=True, rows=16, columns=20, headless=False,
+                 view_rows=None, view_columns=None):
         """
         Initialize the game board.
 
@@ -13,37 +18,230 @@ class Board:
             width: width of the board in pixels
             height: height of the board in pixels
             background: background object for the board (optional)
+            dirty: repaint only the regions that changed since the last frame (default: True)
+            rows: number of rows of the grid (default: 16)
+            columns: number of columns of the grid (default: 20)
+            headless: use an off-screen surface and skip drawing entirely (default: False)
+            view_rows: number of rows shown at once, a camera scrolls over the others (default: all of them)
+            view_columns: number of columns shown at once, a camera scrolls over the others (default: all of them)
         """
-        self.surface = pygame.display.set_mode((width, height), 0, 32)
-        pygame.display.set_caption('Kaboom Combat')
+        if headless:
+            self.surface = pygame.Surface((width, height), 0, 32)
+        else:
+            self.surface = pygame.display.set_mode((width, height), 0, 32)
+            pygame.display.set_caption('Kaboom Combat')
+        self.headless = headless
+        self.geometry = GridGeometry(width, height, rows, columns, view_rows, view_columns)
+        self.camera = Camera(self.geometry) if self.geometry.scrolls else None
         self.background = background
+        self.dirty = dirty
+        self.full_redraw = True
+        self.states = {}
+        self.layer_states = {}
+        self.drawn_offset = None
+
+    def invalidate(self):
+        """
+        Force the next draw to repaint and update the whole window.
+        """
+        self.full_redraw = True
+
+    def draw(self, *layers):
+        """
+        Method to draw the board and layers of objects on it.
+
+        Each layer is drawn with a single Surface.blits call, in order. A layer
+        is either a Layer or StaticLayer of entities with fixed images and
+        positions, which is only compared with the previous frame when its
+        membership changed, or any sequence of objects, which are compared one
+        by one, in window pixels unless they are in a FieldLayer.
+
+        When the board scrolls, the entities of Layers and FieldLayers are
+        moved by the camera and clipped to the playing field, and only the
+        entities of the cells in view are blitted or compared.
+
+        In dirty mode only the regions whose objects appeared, moved, changed
+        image or disappeared are repainted and passed to pygame.display.update.
+        A full redraw is done after invalidate() or when the changed area covers
+        most of the window, which happens on screen transitions, and when the
+        camera moved.
+
+        Args:
+            *layers: Layers, StaticLayers, FieldLayers or sequences of objects with image and rect attributes
+        """
+        if self.headless:
+            return
+
+        sequences = [self.blit_sequence(layer) for layer in layers]
+        dirty_rects = self.changed_regions(layers, sequences)
+        clips = [self.clip(layer) for layer in layers]
+        offset = None if self.camera is None else self.camera.offset
 
-    def draw(self, *args):
+        # A pre-rendered layer drawn first over the board's background already repaints all of it
+        background = self.background
+        if layers and isinstance(layers[0], StaticLayer) and layers[0].background is background:
+            background = None
+
+        if (not self.dirty or self.full_redraw or offset != self.drawn_offset
+                or self.is_mostly_dirty(dirty_rects)):
+            self.full_redraw = False
+            self.drawn_offset = offset
+            if background is not None:
+                self.surface.blit(background.image, (0, 0))
+            for sequence, clip in zip(sequences, clips):
+                self.surface.set_clip(clip)
+                self.surface.blits(sequence, False)
+            self.surface.set_clip(None)
+            pygame.display.update()
+            return
+
+        for rect in dirty_rects:
+            # Restore the background patch and repaint everything overlapping it
+            self.surface.set_clip(rect)
+            if background is not None:
+                self.surface.blit(background.image, rect, rect)
+            for sequence, clip in zip(sequences, clips):
+                self.surface.set_clip(rect if clip is None else rect.clip(clip))
+                self.surface.blits([blit for blit in sequence if rect.colliderect(blit[1])], False)
+        self.surface.set_clip(None)
+
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    def blit_sequence(self, layer):
         """
-        Method to draw the board and objects on it.
+        Get the (image, rect) pairs drawing a layer.
 
         Args:
-            *args: positional arguments representing the objects to be drawn
+            layer: Layer, StaticLayer, FieldLayer or sequence of objects
+
+        Returns:
+            list: blit sequence for pygame.Surface.blits, in window pixels
         """
-        self.surface.blit(self.background.image, (0, 0))
+        camera = self.camera
+        if isinstance(layer, StaticLayer):
+            return layer.blits(camera)
+        if isinstance(layer, Layer):
+            return layer.blits() if camera is None else camera.blits(layer)
+        if camera is not None and isinstance(layer, FieldLayer):
+            return [(obj.image, camera.to_screen(self.drawn_rect(obj))) for obj in layer]
+        return [(obj.image, self.drawn_rect(obj)) for obj in layer]
 
-        for arg in args:
-            if isinstance(arg, pygame.sprite.Group) or isinstance(arg, Hero) or isinstance(arg, Bomb):
-                # If the object is a sprite group, hero, or bomb, draw it on the board
-                arg.draw_on(self.surface)
-                if isinstance(arg, Hero):
-                    # If the object is a hero, draw hearts representing the health points
-                    for heart in arg.hearts:
-                        heart.draw_on(self.surface)
-                if isinstance(arg, Bomb):
-                    # If the object is a bomb, draw marks indicating the places that will be destroyed
-                    for mark in arg.delete_marks:
-                        mark.draw_on(self.surface)
-            elif not isinstance(arg, tuple):
-                # If the object is not a tuple, draw it on the board
-                arg.draw_on(self.surface)
+    def clip(self, layer):
+        """
+        Get the region a layer is drawn in.
 
-        pygame.display.update()
+        Args:
+            layer: Layer, StaticLayer, FieldLayer or sequence of objects
+
+        Returns:
+            pygame.Rect: the playing field for the entities of a scrolling board, None for the whole window
+        """
+        if self.camera is not None and isinstance(layer, (Layer, FieldLayer)):
+            return self.camera.field
+        return None
+
+    def changed_regions(self, layers, sequences):
+        """
+        Compare the layers with the previous frame and return the regions to repaint.
+
+        Args:
+            layers: layers drawn in this frame
+            sequences: blit sequences of the layers
+
+        Returns:
+            list: non-overlapping pygame.Rect regions that changed
+        """
+        states = {}
+        layer_states = {}
+        dirty_rects = []
+        for layer, sequence in zip(layers, sequences):
+            if isinstance(layer, (Layer, StaticLayer)):
+                # Entities of a layer do not change, only look at the changes of its membership
+                previous = self.layer_states.pop(layer, None)
+                if previous != layer.version:
+                    dirty_rects.extend(self.layer_changes(layer, previous))
+                layer_states[layer] = layer.version
+                continue
+
+            for obj, (image, rect) in zip(layer, sequence):
+                state = (id(image), tuple(rect))
+                states[id(obj)] = state
+                previous = self.states.pop(id(obj), None)
+                if previous != state:
+                    dirty_rects.append(pygame.Rect(state[1]))
+                    if previous is not None:
+                        dirty_rects.append(pygame.Rect(previous[1]))
+
+        # Objects and layers that are no longer drawn leave their old regions dirty
+        for previous in self.states.values():
+            dirty_rects.append(pygame.Rect(previous[1]))
+        for layer, previous in self.layer_states.items():
+            dirty_rects.extend(self.layer_changes(layer, previous))
+            dirty_rects.extend(self.layer_changes(layer, None))
+        self.states = states
+        self.layer_states = layer_states
+
+        merged = []
+        for rect in dirty_rects:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def layer_changes(self, layer, version):
+        """
+        Get the regions where a layer changed since a version drawn before.
+
+        Args:
+            layer: Layer or StaticLayer
+            version: version of the layer drawn before, or None for every region it covers now
+
+        Returns:
+            list: changed pygame.Rect regions in window pixels, or the whole window when there are too many
+                to merge, or the playing field when the board scrolls and every region is asked for
+        """
+        camera = self.camera
+        if version is None:
+            if camera is not None:
+                return [camera.field.copy()]
+            regions = [rect for _, _, rect in layer.regions()]
+        else:
+            changes = layer.changes_since(version)
+            regions = None if changes is None else [rect for _, _, rect in changes]
+        if regions is None or len(regions) > MAX_LAYER_CHANGES:
+            return [self.surface.get_rect()]
+        if camera is None:
+            return [pygame.Rect(rect) for rect in regions]
+        # Changes out of view are clipped away
+        return [region for region in map(camera.region, regions) if region]
+
+    def drawn_rect(self, obj):
+        """
+        Get the region an object paints, which for interpolated heroes differs from their rect.
+
+        Args:
+            obj: drawn object
+
+        Returns:
+            pygame.Rect: region covered by the object on the board
+        """
+        return getattr(obj, 'draw_rect', obj.rect)
+
+    def is_mostly_dirty(self, dirty_rects):
+        """
+        Check if the changed regions cover more than half of the board.
+
+        Args:
+            dirty_rects: regions returned by changed_regions
+
+        Returns:
+            bool: True if a full redraw is cheaper than repainting the regions
+        """
+        area = sum(rect.width * rect.height for rect in dirty_rects)
+        return area * 2 > self.surface.get_width() * self.surface.get_height()
 
 
 class Background:
@@ -56,7 +254,8 @@ class Background:
             width: width of the background in pixels
             height: height of the background in pixels
         """
-        self.image = pygame.transform.scale(pygame.image.load(image_file), (width, height))
+        self.image = images.load(image_file, (width, height))
+        self.rect = self.image.get_rect()
 
     def draw_on(self, surface):
         """
@@ -66,3 +265,152 @@ class Background:
             surface: surface to draw the background on
         """
         surface.blit(self.image, (0, 0))
+
+
+class StaticLayer:
+    def __init__(self, background, layer):
+        """
+        Initialize a pre-rendered composite of the background and a layer of static entities.
+
+        The composite is kept in sync with the layer incrementally by replaying
+        its logged changes: added entities are blitted in, and the background
+        patch is restored where entities were removed. Drawing it is a single
+        blit however many entities it holds, and updating it only costs the
+        changes. On a scrolling board it holds the entities in view, and the
+        field is rendered again from the cells in view when the camera moves,
+        the background staying in place.
+
+        The background must be opaque. The composite is then kept opaque too,
+        so drawing it and restoring background patches are plain copies, and
+        the board skips its own background when the composite is drawn first.
+        The entities must not overlap each other nor anything drawn below them
+        in later layers, like cubes, one per cell, which heroes and items never
+        overlap.
+
+        Args:
+            background: background object with image and rect attributes
+            layer: Layer of entities with fixed images and positions, e.g. the world's cubes
+        """
+        self.background = background
+        self.layer = layer
+        self.floor = background.image.convert() if pygame.display.get_surface() is not None else background.image
+        self.image = self.floor.copy()
+        self.rect = self.image.get_rect()
+        self.synced_version = None
+        self.synced_offset = None
+
+    @property
+    def version(self):
+        """
+        Membership version of the underlying layer.
+        """
+        return self.layer.version
+
+    def sync(self, camera=None):
+        """
+        Update the composite with the entities added to or removed from the layer since the last sync.
+
+        Args:
+            camera: Camera of a scrolling board, only the entities in view are drawn (optional)
+        """
+        offset = None if camera is None else camera.offset
+        if self.synced_version == self.layer.version and self.synced_offset == offset:
+            return
+        changes = None
+        if self.synced_version is not None and self.synced_offset == offset:
+            changes = self.layer.changes_since(self.synced_version)
+
+        if camera is not None:
+            self.image.set_clip(camera.field)
+        if changes is None:
+            # First sync, camera moved or too far behind the log, render every entity in view again
+            if camera is None:
+                self.image.blit(self.floor, (0, 0))
+                self.image.blits([(entity.image, entity.rect) for entity in self.layer], False)
+            else:
+                self.image.blit(self.floor, camera.field, camera.field)
+                self.image.blits(camera.blits(self.layer), False)
+        else:
+            for added, image, rect in changes:
+                if camera is not None:
+                    rect = camera.to_screen(rect)
+                if added:
+                    self.image.blit(image, rect)
+                else:
+                    self.image.blit(self.floor, rect, rect)
+        self.image.set_clip(None)
+        self.synced_version = self.layer.version
+        self.synced_offset = offset
+
+    def blits(self, camera=None):
+        """
+        Get the blit sequence drawing the composite, after bringing it up to date.
+
+        Args:
+            camera: Camera of a scrolling board (optional)
+
+        Returns:
+            list: a single (image, rect) pair
+        """
+        self.sync(camera)
+        return [(self.image, self.rect)]
+
+    def regions(self):
+        """
+        Get the entities, images and regions of the underlying layer, which change the composite.
+
+        Returns:
+            frozenset: (id of the entity, id of the image, (x, y, width, height)) tuples
+        """
+        return self.layer.regions()
+
+    def changes_since(self, version):
+        """
+        Get the changes of the underlying layer made after a version.
+
+        Args:
+            version: a previous value of self.version
+
+        Returns:
+            list: (added, image, (x, y, width, height)) of each change, or None if some were dropped
+        """
+        return self.layer.changes_since(version)
+
+    def __len__(self):
+        """
+        Count the entities rendered into the composite.
+
+        Returns:
+            int: number of entities in the underlying layer
+        """
+        return len(self.layer)
+
+
+class FieldLayer:
+    def __init__(self, *objects):
+        """
+        Initialize a layer of moving objects positioned in board pixels, like the heroes.
+
+        The board compares them with the previous frame one by one, like other
+        sequences of objects, but on a scrolling board it moves them by the
+        camera and clips them to the playing field.
+
+        Args:
+            *objects: objects with image and rect attributes
+        """
+        self.objects = objects
+
+    def __iter__(self):
+        """
+        Iterate over the objects in drawing order.
+        """
+        return iter(self.objects)
+
+    def __len__(self):
+        """
+        Count the objects.
+
+        Returns:
+            int: number of objects in the layer
+        """
+        return len(self.objects)
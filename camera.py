@@ -0,0 +1,174 @@
+import math
+import pygame
+
+
+class Camera:
+    def __init__(self, geometry):
+        """
+        Initialize a camera showing part of a board with more rows or columns than the view.
+
+        Entities keep their positions in board pixels. The camera moves them on
+        screen by its offset, and takes the entities of a layer from the cells
+        in view through the layer's grid index, so drawing costs the same
+        however many cells are out of view.
+
+        Args:
+            geometry: GridGeometry of the board
+        """
+        self.geometry = geometry
+
+        # Playing field on the screen, showing the board from the offset on
+        left = math.floor(geometry.left)
+        top = math.floor(geometry.top)
+        self.field = pygame.Rect(left, top, geometry.view_width, geometry.view_height)
+
+        # Offset in board pixels, between 0 and the one showing the bottom-right corner of the board
+        self.x = 0
+        self.y = 0
+        self.max_x = math.ceil(geometry.right - geometry.view_right)
+        self.max_y = math.ceil(geometry.bottom - geometry.view_bottom)
+
+        # Blit sequence of each layer with the version and offset it was built for
+        self.sequences = {}
+
+    @property
+    def offset(self):
+        """
+        Offset of the view in board pixels, as an (x, y) tuple.
+        """
+        return self.x, self.y
+
+    def move_to(self, x, y):
+        """
+        Move the view, without going past the edges of the board.
+
+        Args:
+            x: offset in board pixels along the x-axis
+            y: offset in board pixels along the y-axis
+
+        Returns:
+            bool: True if the offset changed
+        """
+        x = min(max(round(x), 0), self.max_x)
+        y = min(max(round(y), 0), self.max_y)
+        moved = (x, y) != (self.x, self.y)
+        self.x = x
+        self.y = y
+        return moved
+
+    def follow(self, rects):
+        """
+        Scroll towards the middle of some regions when it leaves the central half of the field.
+
+        The view stays still while the middle moves inside that half, so the
+        field is only repainted entirely when the players get close to its edges.
+        It then scrolls as much as needed to keep every region in the field, if
+        they fit in it together.
+
+        Args:
+            rects: pygame.Rect regions in board pixels, e.g. the heroes
+
+        Returns:
+            bool: True if the view moved
+        """
+        field = self.field
+        x = sum(rect.centerx for rect in rects) / len(rects) - self.x
+        y = sum(rect.centery for rect in rects) / len(rects) - self.y
+        left = field.left + field.width / 4
+        right = field.right - field.width / 4
+        top = field.top + field.height / 4
+        bottom = field.bottom - field.height / 4
+        dx = x - left if x < left else x - right if x > right else 0
+        dy = y - top if y < top else y - bottom if y > bottom else 0
+
+        # Stay within the offsets showing every region, the right and bottom ones win if they do not fit together
+        x = max(min(self.x + dx, min(rect.left for rect in rects) - field.left),
+                max(rect.right for rect in rects) - field.right)
+        y = max(min(self.y + dy, min(rect.top for rect in rects) - field.top),
+                max(rect.bottom for rect in rects) - field.bottom)
+        return self.move_to(x, y)
+
+    def view(self):
+        """
+        Get the part of the board shown on the field.
+
+        Returns:
+            pygame.Rect: the field in board pixels
+        """
+        return self.field.move(self.x, self.y)
+
+    def cells(self, region=None):
+        """
+        Get the cells whose entities may be in view.
+
+        Cell origins are rounded up, so an entity can reach a pixel or two into
+        the next cell, the span includes the cells around the view.
+
+        Args:
+            region: part of the field on the screen to get the cells of (default: the whole field)
+
+        Returns:
+            tuple: (i0, j0, i1, j1) first and last row and column, possibly outside the board
+        """
+        geometry = self.geometry
+        view = self.view() if region is None else region.move(self.x, self.y)
+        return (geometry.row_at(view.top) - 1, geometry.column_at(view.left) - 1,
+                geometry.row_at(view.bottom - 1) + 1, geometry.column_at(view.right - 1) + 1)
+
+    def to_screen(self, rect):
+        """
+        Move a region from board pixels to the screen.
+
+        Args:
+            rect: pygame.Rect or (x, y, width, height) in board pixels
+
+        Returns:
+            pygame.Rect: the region on the screen, possibly outside the field
+        """
+        return pygame.Rect(rect).move(-self.x, -self.y)
+
+    def region(self, rect):
+        """
+        Get the part of the field where a region of the board is drawn.
+
+        Args:
+            rect: pygame.Rect or (x, y, width, height) in board pixels
+
+        Returns:
+            pygame.Rect: the region on the screen clipped to the field, empty if it is out of view
+        """
+        return self.to_screen(rect).clip(self.field)
+
+    def blits(self, layer, region=None):
+        """
+        Get the blit sequence drawing the entities of a layer that are in view.
+
+        The entities are taken from the cells in view through the layer's grid
+        index, layers without one, like the few delete marks, are checked entity
+        by entity. The sequence of the whole field is cached until the layer
+        changes or the view moves.
+
+        Args:
+            layer: Layer of entities with fixed images and positions
+            region: part of the field on the screen to get the entities of (default: the whole field)
+
+        Returns:
+            list: (image, rect) pairs with the rects moved to the screen
+        """
+        key = (layer.version, self.x, self.y)
+        if region is None:
+            cached = self.sequences.get(layer)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        if layer.index is not None:
+            entities = layer.index.within(*self.cells(region))
+        else:
+            view = self.view() if region is None else region.move(self.x, self.y)
+            entities = [entity for entity in layer if view.colliderect(entity.rect)]
+        dx = -self.x
+        dy = -self.y
+        sequence = [(entity.image, entity.rect.move(dx, dy)) for entity in entities]
+        if region is None:
+            self.sequences[layer] = (key, sequence)
+        return sequence
@@ -1,89 +1,92 @@
-import main
-import drawable as dr
-
-
 class Collisions:
     def bomb_collision(self):
         """
         Handle bomb collisions with heroes, cubes, and countdown timers.
+
+        Every cell in a blast is looked up directly in the cube and bomb indexes.
+        Bombs caught in a blast explode in the same tick, and the destroyed cubes
+        and exploded bombs are removed in one pass at the end.
         """
-        for bomb in self.bombs:
+        world = self.world
+        for bomb in world.bombs:
             if bomb.timer == 50:
-                delete_marks = []
-                for x, y in [(0, 0), (0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    if (bomb.i + x) >= 0 and (bomb.j + y) >= 0 and (bomb.j + y) <= len(main.cord_list[0]) - 1:
-                        delete_marks.append(
-                            dr.Delete(self.width, self.height, i=bomb.i + x, j=bomb.j + y))
-                        bomb.set_marks(delete_marks)
-            if bomb.timer == 0:
-                bomb_position_hero1 = (
-                    self.hero1.get_position_i(), self.hero1.get_position_j())
-                bomb_position_hero2 = (
-                    self.hero2.get_position_i(), self.hero2.get_position_j())
-
-                # Check collision with hero1
-                if (bomb.i, bomb.j) == bomb_position_hero1 or \
-                        abs(bomb.i - bomb_position_hero1[0]) + abs(bomb.j - bomb_position_hero1[1]) == 1:
-                    if self.hero1.shield == 0:
-                        self.hero1.remove_live()
-                        main.lock.acquire()
-                        main.cord_list[bomb.i][bomb.j] = 0
-                        main.lock.release()
-                        self.score2.score += 10
+                bomb.set_marks([world.mark_pool.acquire(self.board.geometry, i=i, j=j)
+                                for i, j in world.grid.blast_cells(bomb.i, bomb.j, bomb.radius)])
+                for mark in bomb.delete_marks:
+                    world.marks.add(mark)
+
+        exploding = [bomb for bomb in world.bombs if bomb.timer == 0]
+        exploded = set()
+        destroyed = set()
+        heroes = [
+            (self.hero1, (self.hero1.get_position_i(), self.hero1.get_position_j()),
+             self.score2, self.profitems1),
+            (self.hero2, (self.hero2.get_position_i(), self.hero2.get_position_j()),
+             self.score1, self.profitems2),
+        ]
+
+        while exploding:
+            bomb = exploding.pop()
+            if bomb in exploded:
+                continue
+            exploded.add(bomb)
+            world.explosions += 1
+            cells = world.grid.blast_cells(bomb.i, bomb.j, bomb.radius)
+
+            # Check collision with heroes
+            for hero, position, opponent_score, profitems in heroes:
+                if position in cells:
+                    if hero.shield == 0:
+                        hero.remove_live()
+                        opponent_score.score += 10
                     else:
-                        self.hero1.shield = 0
-                        self.profitems1.remove_shield()
-
-                # Check collision with hero2
-                elif (bomb.i, bomb.j) == bomb_position_hero2 or \
-                        abs(bomb.i - bomb_position_hero2[0]) + abs(bomb.j - bomb_position_hero2[1]) == 1:
-                    if self.hero2.shield == 0:
-                        self.hero2.remove_live()
-                        main.lock.acquire()
-                        main.cord_list[bomb.i][bomb.j] = 0
-                        main.lock.release()
-                        self.score1.score += 10
-                    else:
-                        self.hero2.shield = 0
-                        self.profitems2.remove_shield()
-
-                # Check collision with cubes
-                adjacent_positions = [(bomb.i + 1, bomb.j), (bomb.i - 1, bomb.j), (bomb.i, bomb.j + 1),
-                                      (bomb.i, bomb.j - 1)]
-                for cube in self.cubes:
-                    for position in adjacent_positions:
-                        if (cube.i, cube.j) == position:
-                            self.cubes.remove(cube)
-                            main.lock.acquire()
-                            main.cord_list[cube.i][cube.j] = 0
-                            main.lock.release()
-                            break
-
-                if bomb.player == 1:
-                    self.hero1.bomb = 1
-                else:
-                    self.hero2.bomb = 1
-
-                # Remove bomb after checking collisions
-                self.bombs.remove(bomb)
-
-        # Remove bombs with timers greater than 0
-        self.bombs = [bomb for bomb in self.bombs if bomb.timer > 0]
+                        hero.shield = 0
+                        profitems.remove_shield()
+
+            # Check collision with cubes and set off other bombs in the blast
+            for i, j in cells:
+                destroyed.update(world.cube_index.at(i, j))
+                exploding.extend(world.bomb_index.at(i, j))
+
+            if bomb.player == 1:
+                self.hero1.bomb = 1
+            else:
+                self.hero2.bomb = 1
+
+        if exploded or destroyed:
+            # Remove exploded bombs and destroyed cubes after checking collisions. The cells are freed in
+            # board order, the sets are ordered by memory address, which would make later spawns differ between runs
+            for entity in sorted((*exploded, *destroyed), key=lambda entity: (entity.i, entity.j)):
+                world.grid.clear(entity.i, entity.j)
+            world.lock.acquire()
+            for bomb in exploded:
+                world.bombs.remove(bomb)
+                for mark in bomb.delete_marks:
+                    world.marks.discard(mark)
+            for cube in destroyed:
+                world.cubes.remove(cube)
+            world.lock.release()
+
+            # Recycle the removed entities for later spawns and blasts
+            for bomb in exploded:
+                world.mark_pool.release_all(bomb.delete_marks)
+                world.bomb_pool.release(bomb)
+            world.cube_pool.release_all(destroyed)
 
         # Update bomb timers
-        for bomb in self.bombs:
+        for bomb in world.bombs:
             bomb.bomb_delay()
 
     def item_collision(self):
         """
         Handle collisions between heroes and items.
         """
-        for item in self.items:
+        for item in self.world.items:
             if self.hero1.rect.colliderect(item.rect):
                 self.process_item_collision(item, self.hero1, self.profitems1)
                 break
 
-        for item in self.items:
+        for item in self.world.items:
             if self.hero2.rect.colliderect(item.rect):
                 self.process_item_collision(item, self.hero2, self.profitems2)
                 break
@@ -97,27 +100,40 @@ class Collisions:
             hero (Hero): The hero that collided with the item.
             profitems (ProfilePowerUps): The power-up profile associated with the hero.
         """
-        self.items.remove(item)
+        world = self.world
+        world.lock.acquire()
+        world.items.remove(item)
+        world.lock.release()
         if item.item_type == 0:  # heart item
             hero.add_live()
         if item.item_type == 1:  # shield item
             hero.shield = 1
             profitems.add_shield()
-        main.cord_list[item.i][item.j] = 0
-        del item
+        world.grid.clear(item.i, item.j)
+
+        # Recycle the item for later spawns
+        world.item_pool.release(item)
 
 
-def check_collision(hero, cubes):
+def check_collision(hero, cube_index):
     """
     Check collision between the hero and cubes.
 
+    Only the cubes in the cells overlapped by the hero and their neighbors are
+    tested, so the cost does not depend on how many cubes are on the board.
+
     Args:
         hero (Hero): The hero object to check collision for.
+        cube_index (GridIndex): Cubes indexed by their cell.
 
     Returns:
         bool: True if collision occurs, False otherwise.
     """
-    for cube in cubes:
+    i0 = hero.get_position_i()
+    j0 = hero.get_position_j()
+    i1 = hero.get_position_i(hero.rect.bottom - 1)
+    j1 = hero.get_position_j(hero.rect.right - 1)
+    for cube in cube_index.around(i0, j0, i1, j1):
         if hero.rect.colliderect(cube.rect):
             return True
     return False
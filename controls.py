@@ -0,0 +1,130 @@
+import random
+import pygame
+
+# Input bits of one hero for one simulation tick
+MOVE_UP = 1
+MOVE_DOWN = 2
+MOVE_LEFT = 4
+MOVE_RIGHT = 8
+DROP_BOMB = 16
+
+# Direction of each movement bit, applied in this order
+MOVES = {
+    MOVE_UP: (0, -1),
+    MOVE_DOWN: (0, 1),
+    MOVE_LEFT: (-1, 0),
+    MOVE_RIGHT: (1, 0),
+}
+
+# Keys controlling hero 1 (arrows and Enter) and hero 2 (W, A, S, D and Space)
+HERO1_KEYS = {
+    pygame.K_UP: MOVE_UP,
+    pygame.K_DOWN: MOVE_DOWN,
+    pygame.K_LEFT: MOVE_LEFT,
+    pygame.K_RIGHT: MOVE_RIGHT,
+    pygame.K_RETURN: DROP_BOMB,
+    pygame.K_KP_ENTER: DROP_BOMB,
+}
+HERO2_KEYS = {
+    pygame.K_w: MOVE_UP,
+    pygame.K_s: MOVE_DOWN,
+    pygame.K_a: MOVE_LEFT,
+    pygame.K_d: MOVE_RIGHT,
+    pygame.K_SPACE: DROP_BOMB,
+}
+
+
+class KeyboardController:
+    def __init__(self, bindings):
+        """
+        Initialize a controller reading a hero's input from the keyboard.
+
+        Args:
+            bindings: dictionary mapping pygame key codes to input bits
+        """
+        self.bindings = bindings
+
+    def act(self, game, hero):
+        """
+        Get the hero's input for the current tick.
+
+        Args:
+            game: the game being played
+            hero: the controlled hero
+
+        Returns:
+            int: combination of MOVE_* and DROP_BOMB bits
+        """
+        keys = pygame.key.get_pressed()
+        action = 0
+        for key, bit in self.bindings.items():
+            if keys[key]:
+                action |= bit
+        return action
+
+
+class RandomController:
+    def __init__(self, seed=None, turn_chance=0.05, bomb_chance=0.01):
+        """
+        Initialize a controller that wanders around and drops bombs at random.
+
+        Args:
+            seed: seed of the controller's random number generator (optional)
+            turn_chance: probability of picking a new direction each tick (default: 0.05)
+            bomb_chance: probability of dropping a bomb each tick (default: 0.01)
+        """
+        self.rng = random.Random(seed)
+        self.turn_chance = turn_chance
+        self.bomb_chance = bomb_chance
+        self.direction = 0
+
+    def act(self, game, hero):
+        """
+        Get the hero's input for the current tick.
+
+        Args:
+            game: the game being played
+            hero: the controlled hero
+
+        Returns:
+            int: combination of MOVE_* and DROP_BOMB bits
+        """
+        if self.rng.random() < self.turn_chance:
+            self.direction = self.rng.choice([0, *MOVES])
+        action = self.direction
+        if self.rng.random() < self.bomb_chance:
+            action |= DROP_BOMB
+        return action
+
+
+class ScriptedController:
+    def __init__(self, script, loop=True):
+        """
+        Initialize a controller that plays back a fixed sequence of inputs.
+
+        Args:
+            script: list of (action, ticks) pairs, each action held for its number of ticks
+            loop: start the script over when it ends, otherwise stay idle (default: True)
+        """
+        self.actions = [action for action, ticks in script for _ in range(ticks)]
+        self.loop = loop
+        self.position = 0
+
+    def act(self, game, hero):
+        """
+        Get the hero's input for the current tick.
+
+        Args:
+            game: the game being played
+            hero: the controlled hero
+
+        Returns:
+            int: combination of MOVE_* and DROP_BOMB bits
+        """
+        if self.position >= len(self.actions):
+            if not self.loop or not self.actions:
+                return 0
+            self.position = 0
+        action = self.actions[self.position]
+        self.position += 1
+        return action
@@ -1,9 +1,6 @@
 import pygame
-import pygame.locals
 import random
-import sys
-import math
-from main import *
+from assets import images, texts, fonts
 
 
 class Drawable:
@@ -19,8 +16,9 @@ class Drawable:
         """
         self.width = width
         self.height = height
-        self.surface = pygame.Surface(
-            (width, height), pygame.SRCALPHA, 32).convert_alpha()
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
         self.rect = self.surface.get_rect(x=x, y=y)
 
     def draw_on(self, surface):
@@ -34,7 +32,8 @@ class Drawable:
 
 
 class Hero(Drawable):
-    def __init__(self, board, image_file, width, height, x, y, lives=3, name="Player", shield=0, bomb=1):
+    def __init__(self, board, image_file, width, height, x, y, lives=3, name="Player", shield=0, bomb=1,
+                 blast_radius=1):
         """
         Initialize a hero object.
 
@@ -49,6 +48,7 @@ class Hero(Drawable):
             name: name of the hero (default: "Player")
             shield: shield level of the hero (default: 0)
             bomb: number of bombs the hero has (default: 1)
+            blast_radius: number of cells the hero's bombs reach in each direction (default: 1)
         """
         super().__init__(width, height, x, y)
         self.image = None
@@ -59,6 +59,13 @@ class Hero(Drawable):
         self.load_image(image_file)
         self.shield = shield
         self.bomb = bomb
+        self.blast_radius = blast_radius
+        self.previous_rect = self.rect.copy()
+        self.draw_rect = self.rect.copy()
+
+        # Kept for reset, which restores them when a new match starts
+        self.start_position = self.rect.topleft
+        self.start_stats = (lives, shield, bomb, blast_radius)
 
     def load_image(self, image_file):
         """
@@ -67,10 +74,19 @@ class Hero(Drawable):
         Args:
             image_file: path to the image file for the hero
         """
-        self.image = pygame.transform.scale(
-            pygame.image.load(image_file), (self.width, self.height))
+        self.image = images.load(image_file, (self.width, self.height))
         self.surface.blit(self.image, (0, 0))
 
+    def reset(self):
+        """
+        Put the hero back at its starting position with its starting lives and power-ups, for a new match.
+        """
+        self.lives, self.shield, self.bomb, self.blast_radius = self.start_stats
+        self.rect.topleft = self.start_position
+        self.previous_rect = self.rect.copy()
+        self.draw_rect = self.rect.copy()
+        self.update_hearts()
+
     def set_hearts(self, hearts):
         """
         Set the hearts representing the hero's health.
@@ -89,41 +105,80 @@ class Hero(Drawable):
             heart.live_type = i < self.lives
             heart.update_image()
 
-    def move(self, x, y, board):
+    def move(self, x, y, board, other=None):
         """
         Move the hero by a given amount in the x and y directions.
 
+        On boards larger than the view, the hero also stays within a view of
+        the other hero, so the camera can always show both of them.
+
         Args:
             x: amount to move in the x direction
             y: amount to move in the y direction
             board: reference to the game board
-        """
-        x = max(board.surface.get_width() * 0.25 - self.rect.x,
-                min(x, board.surface.get_width() - self.width - board.surface.get_width() * 0.0484 - self.rect.x))
-        y = max(board.surface.get_height() * 0.04 - self.rect.y,
-                min(y, board.surface.get_height() - self.height - board.surface.get_height() * 0.032 - self.rect.y))
+            other: the other hero (optional)
+        """
+        geometry = board.geometry
+        left, top, right, bottom = geometry.left, geometry.top, geometry.right, geometry.bottom
+        if other is not None and geometry.scrolls:
+            left = max(left, other.rect.right - geometry.view_width)
+            top = max(top, other.rect.bottom - geometry.view_height)
+            right = min(right, other.rect.left + geometry.view_width)
+            bottom = min(bottom, other.rect.top + geometry.view_height)
+        x = max(left - self.rect.x, min(x, right - self.width - self.rect.x))
+        y = max(top - self.rect.y, min(y, bottom - self.height - self.rect.y))
         self.rect.x += x
         self.rect.y += y
 
-    def get_position_j(self):
+    def save_position(self):
+        """
+        Remember the position before a simulation tick, used for interpolation.
+        """
+        self.previous_rect = self.rect.copy()
+
+    def interpolate(self, alpha):
+        """
+        Place the drawn hero between its previous and current position.
+
+        Args:
+            alpha: fraction of a tick elapsed since the last update (0 to 1)
+        """
+        self.draw_rect = self.rect.copy()
+        self.draw_rect.x = round(self.previous_rect.x + (self.rect.x - self.previous_rect.x) * alpha)
+        self.draw_rect.y = round(self.previous_rect.y + (self.rect.y - self.previous_rect.y) * alpha)
+
+    def draw_on(self, surface):
+        """
+        Draw the hero at its interpolated position.
+
+        Args:
+            surface: surface to draw the hero on
+        """
+        surface.blit(self.surface, self.draw_rect)
+
+    def get_position_j(self, x=None):
         """
         Get the column index of the hero's position on the game board grid.
 
+        Args:
+            x: x-coordinate to map instead of the hero's left edge (optional)
+
         Returns:
             int: The column index.
         """
-        return math.floor((self.rect.x - self.board.surface.get_width() * 0.25) / (
-            self.board.surface.get_width() * 0.7 / len(cord_list[0])))
+        return self.board.geometry.column_at(self.rect.x if x is None else x)
 
-    def get_position_i(self):
+    def get_position_i(self, y=None):
         """
         Get the row index of the hero's position on the game board grid.
 
+        Args:
+            y: y-coordinate to map instead of the hero's top edge (optional)
+
         Returns:
             int: The row index.
         """
-        return math.floor((self.rect.y - self.board.surface.get_height() * 0.04) / (
-            self.board.surface.get_height() * 0.9265 / len(cord_list)))
+        return self.board.geometry.row_at(self.rect.y if y is None else y)
 
     def remove_live(self):
         """
@@ -134,7 +189,9 @@ class Hero(Drawable):
                 self.lives -= 1
             elif self.lives == 1:
                 self.lives -= 1
-                print(f"Player {self.name} is dead")
+                # Headless runs keep stdout for the results of simulation.py and replay.py
+                if not self.board.headless:
+                    print(f"Player {self.name} is dead")
                 pygame.event.post(pygame.event.Event(pygame.USEREVENT))
             self.update_hearts()
         else:
@@ -175,8 +232,7 @@ class Heart:
         Update the image of the heart based on its live type.
         """
         image_file = 'images/full_heart.png' if self.live_type else 'images/dead_heart.png'
-        self.image = pygame.transform.scale(pygame.image.load(image_file),
-                                            (int(self.width * 0.023), int(self.height * 0.035)))
+        self.image = images.load(image_file, (int(self.width * 0.023), int(self.height * 0.035)))
         self.rect = self.image.get_rect()
         self.rect.x = self.x_pos
         self.rect.y = self.y_pos
@@ -205,8 +261,7 @@ class Button:
         self.height = height
         self.x_pos = width * 0.4
         self.y_pos = button_height
-        self.image = pygame.transform.scale(pygame.image.load(self.image_path),
-                                            (int(self.width * 0.2), int(self.height * 0.118)))
+        self.image = images.load(self.image_path, (int(self.width * 0.2), int(self.height * 0.118)))
         self.rect = self.image.get_rect(x=self.x_pos, y=self.y_pos)
 
     def draw_on(self, surface):
@@ -220,30 +275,23 @@ class Button:
 
 
 class Delete:
-    def __init__(self, width, height, i=0, j=0):
+    __slots__ = ('image', 'rect')
+
+    def __init__(self, geometry, i=0, j=0):
         """
         Initialize a delete mark object.
 
+        Like the other grid entities it only references the shared cached image
+        and its position, so marks are cheap to create on every blast.
+
         Args:
-            width: width of the game board
-            height: height of the game board
+            geometry: grid geometry of the game board
             i: row index of the delete mark (default: 0)
             j: column index of the delete mark (default: 0)
         """
-        self.image_path = 'images/delete_mark.png'
-        self.width = width
-        self.height = height
-        rows = len(cord_list)
-        columns = len(cord_list[0])
-        x = math.floor((width * 0.65) / rows)
-        y = math.floor((height * 0.91) / columns)
-        self.x_pos = math.ceil(
-            (width * 0.25) + math.ceil((width * 0.7 / columns) * j))
-        self.y_pos = math.ceil(
-            (height * 0.04) + math.ceil((height * 0.9265 / rows) * i))
-        self.image = pygame.transform.scale(
-            pygame.image.load(self.image_path), (x, y))
-        self.rect = self.image.get_rect(x=self.x_pos, y=self.y_pos)
+        self.image = images.load('images/delete_mark.png', geometry.mark_size)
+        x, y = geometry.origin(i, j)
+        self.rect = self.image.get_rect(x=x, y=y)
 
     def draw_on(self, surface):
         """
@@ -255,7 +303,15 @@ class Delete:
         surface.blit(self.image, self.rect)
 
 
-class Item(Drawable):
+class Item:
+    __slots__ = ('image', 'rect', 'i', 'j', 'item_type')
+
+    # Image of each item type
+    paths = {
+        0: 'images/gold_heart.png',
+        1: 'images/shield.png',
+    }
+
     def __init__(self, board, item_type, width=30, height=30, i=0, j=0):
         """
         Initialize an item object.
@@ -268,60 +324,56 @@ class Item(Drawable):
             i: row index of the item (default: 0)
             j: column index of the item (default: 0)
         """
-        self.image = None
+        self.image = images.load(self.paths[item_type], (width, height))
+        x, y = board.geometry.origin(i, j)
+        self.rect = pygame.Rect(x, y, width, height)
         self.i = i
         self.j = j
-        rows = len(cord_list)
-        columns = len(cord_list[0])
-        x = math.ceil((board.surface.get_width() * 0.25) +
-                      math.ceil((board.surface.get_width() * 0.7 / columns) * j))
-        y = math.ceil((board.surface.get_height() * 0.04) +
-                      math.ceil((board.surface.get_height() * 0.9265 / rows) * i))
-        super().__init__(width, height, x, y)
         self.item_type = item_type
-        image_file = {
-            0: 'images/gold_heart.png',
-            1: 'images/shield.png',
-        }
-        self.load_image(image_file.get(item_type))
 
-    def load_image(self, image_file):
+    def draw_on(self, surface):
         """
-        Load and set the image of the item.
+        Draw the item on the specified surface.
 
         Args:
-            image_file: file path of the image
+            surface: surface to draw the item on
         """
-        self.image = pygame.transform.scale(
-            pygame.image.load(image_file), (self.width, self.height))
-        self.surface.blit(self.image, (0, 0))
+        surface.blit(self.image, self.rect)
 
 
 class Timer:
-    def __init__(self, width, game_time=10):
+    def __init__(self, width, height, game_time=10):
         """
         Initialize a timer object.
 
         Args:
             width: width of the game board
+            height: height of the game board
             game_time: total game time in seconds (default: 10)
         """
-        self.clock_format = None
-        self.time_left = game_time
-        self.font = pygame.font.SysFont('monospace', int(width * 0.045))
+        self.game_time = game_time
+        self.font_size = int(width * 0.045)
+        self.position = (width / 21, height / 9)
+        self.reset()
 
-    def count_down(self):
+    def reset(self):
         """
-        Count down the time until it reaches 0.
+        Set the clock back to the full game time.
         """
-        while self.time_left > 0:
+        self.time_left = self.game_time
+        self.clock_format = f"{self.game_time // 60:02}:{self.game_time % 60:02}"
+
+    def tick(self):
+        """
+        Take one second off the clock and post a game over event when it runs out.
+        """
+        if self.time_left > 0:
             self.time_left -= 1
             minutes = self.time_left // 60
             seconds = self.time_left % 60
             self.clock_format = f"{minutes:02}:{seconds:02}"
-            pygame.time.wait(1000)
-
-        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+            if self.time_left == 0:
+                pygame.event.post(pygame.event.Event(pygame.USEREVENT))
 
     def draw_on(self, surface):
         """
@@ -330,9 +382,28 @@ class Timer:
         Args:
             surface: surface to draw the timer on
         """
-        text = self.font.render(self.clock_format, True, (0, 0, 0))
-        surface.blit(text, (surface.get_width() /
-                     21, surface.get_height() / 9))
+        surface.blit(self.image, self.rect)
+
+    @property
+    def font(self):
+        """
+        Font of the clock, created on first use through the font cache.
+        """
+        return fonts.load('monospace', self.font_size)
+
+    @property
+    def image(self):
+        """
+        Rendered clock, shared through the text cache.
+        """
+        return texts.render(self.font, self.clock_format, (0, 0, 0))
+
+    @property
+    def rect(self):
+        """
+        Region covered by the rendered clock.
+        """
+        return self.image.get_rect(topleft=self.position)
 
 
 class Text:
@@ -346,7 +417,7 @@ class Text:
             x: x-coordinate of the text
             y: y-coordinate of the text
         """
-        self.font = pygame.font.SysFont('monospace', int(width))
+        self.font_size = int(width)
         self.text = text
         self.x = x
         self.y = y
@@ -358,8 +429,99 @@ class Text:
         Args:
             surface: surface to draw the text on
         """
-        text = self.font.render(self.text, True, (0, 0, 0))
-        surface.blit(text, (self.x, self.y))
+        surface.blit(self.image, self.rect)
+
+    @property
+    def font(self):
+        """
+        Font of the text, created on first use through the font cache.
+        """
+        return fonts.load('monospace', self.font_size)
+
+    @property
+    def image(self):
+        """
+        Rendered text, shared through the text cache.
+        """
+        return texts.render(self.font, self.text, (0, 0, 0))
+
+    @property
+    def rect(self):
+        """
+        Region covered by the rendered text.
+        """
+        return self.image.get_rect(x=self.x, y=self.y)
+
+
+class ProfilerOverlay:
+    def __init__(self, profiler, width, refresh=30):
+        """
+        Initialize an overlay showing the frame profiler's percentiles in the top-right corner.
+
+        Args:
+            profiler: FrameProfiler to display
+            width: width of the game window
+            refresh: number of frames between redraws of the overlay (default: 30)
+        """
+        self.profiler = profiler
+        self.width = width
+        self.refresh = refresh
+        self.font_size = max(int(width * 0.01), 10)
+        self.rendered_at = None
+        self.surface = None
+
+    def draw_on(self, surface):
+        """
+        Draw the overlay on the specified surface.
+
+        Args:
+            surface: surface to draw the overlay on
+        """
+        surface.blit(self.image, self.rect)
+
+    def render(self):
+        """
+        Render the percentile table onto a translucent panel.
+
+        Returns:
+            pygame.Surface: the rendered panel
+        """
+        summary = self.profiler.summary()
+        lines = [f"{'phase':<15}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        lines += [f"{phase:<15}{values['p50']:>7.2f}{values['p95']:>7.2f}{values['p99']:>7.2f}"
+                  for phase, values in summary.items()]
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((max(line.get_width() for line in rendered) + 8, line_height * len(lines) + 8),
+                               pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for number, line in enumerate(rendered):
+            panel.blit(line, (4, 4 + number * line_height))
+        return panel
+
+    @property
+    def font(self):
+        """
+        Font of the overlay, created on first use through the font cache.
+        """
+        return fonts.load('monospace', self.font_size)
+
+    @property
+    def image(self):
+        """
+        Rendered overlay, redrawn every refresh frames.
+        """
+        if self.rendered_at is None or self.profiler.frames - self.rendered_at >= self.refresh:
+            self.surface = self.render()
+            self.rendered_at = self.profiler.frames
+        return self.surface
+
+    @property
+    def rect(self):
+        """
+        Region covered by the overlay.
+        """
+        return self.image.get_rect(topright=(self.width, 0))
 
 
 class TextField:
@@ -372,16 +534,16 @@ class TextField:
             width (int): The width of the game window.
 
         Attributes:
-            rect (pygame.Rect): The rectangle representing the position and size of the text field.
+            box (pygame.Rect): The rectangle representing the position and size of the text field.
             color (pygame.Color): The color of the text.
             text (str): The current text in the text field.
-            font (pygame.font.Font): The font used for rendering the text.
+            font_size (int): The size of the font used for rendering the text.
             active (bool): Indicates whether the text field is currently active (editable).
         """
-        self.rect = pygame.Rect(rect)
+        self.box = pygame.Rect(rect)
         self.color = pygame.Color(color)
         self.text = ''
-        self.font = pygame.font.Font(None, int(width * 0.034))
+        self.font_size = int(width * 0.034)
         self.active = False
 
     def handle_event(self, event):
@@ -393,7 +555,7 @@ class TextField:
         """
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             # Check if the mouse click occurred within the text field
-            self.active = self.rect.collidepoint(event.pos)
+            self.active = self.box.collidepoint(event.pos)
         elif event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_RETURN:
                 # End editing when the Enter key is pressed
@@ -412,13 +574,34 @@ class TextField:
         Args:
             surface (pygame.Surface): The surface to draw on.
         """
-        # Render the text
-        text_surface = self.font.render(self.text, True, self.color)
-        surface.blit(text_surface, (self.rect.x + 5, self.rect.y + 5))
+        surface.blit(self.image, self.rect)
 
+    @property
+    def font(self):
+        """
+        Font of the text, pygame's default font created on first use through the font cache.
+        """
+        return fonts.load(None, self.font_size)
 
-class Bomb(Drawable):
-    def __init__(self, board, image_file, player, i, j, timer=250, width=30, height=30):
+    @property
+    def image(self):
+        """
+        Rendered text, shared through the text cache.
+        """
+        return texts.render(self.font, self.text, self.color)
+
+    @property
+    def rect(self):
+        """
+        Region covered by the rendered text.
+        """
+        return self.image.get_rect(x=self.box.x + 5, y=self.box.y + 5)
+
+
+class Bomb:
+    __slots__ = ('image', 'rect', 'i', 'j', 'player', 'timer', 'radius', 'delete_marks')
+
+    def __init__(self, board, image_file, player, i, j, timer=250, width=30, height=30, radius=1):
         """
         Initialize a bomb object.
 
@@ -431,35 +614,26 @@ class Bomb(Drawable):
             timer: countdown timer for the bomb (default: 250)
             width: width of the bomb image (default: 30)
             height: height of the bomb image (default: 30)
+            radius: number of cells the blast reaches in each direction (default: 1)
         """
-        self.image = None
-        self.width = width
-        self.height = height
-        rows = len(cord_list)
-        columns = len(cord_list[0])
-        self.x = math.ceil(
-            (board.surface.get_width() * 0.25) + math.ceil((board.surface.get_width() * 0.7 / columns) * j))
-        self.y = math.ceil(
-            (board.surface.get_height() * 0.04) + math.ceil((board.surface.get_height() * 0.9265 / rows) * i))
-        super().__init__(width, height, self.x, self.y)
-        self.load_image(image_file)
-        self.timer = timer
-        self.player = player
+        self.image = images.load(image_file, (width, height))
+        x, y = board.geometry.origin(i, j)
+        self.rect = pygame.Rect(x, y, width, height)
         self.i = i
         self.j = j
+        self.player = player
+        self.timer = timer
+        self.radius = radius
         self.delete_marks = []
 
-    def load_image(self, image_file):
+    def draw_on(self, surface):
         """
-        Load the bomb image and scale it to the specified width and height.
+        Draw the bomb on the specified surface.
 
         Args:
-            image_file: path to the bomb image file
+            surface: surface to draw the bomb on
         """
-        self.image = pygame.image.load(image_file)
-        self.image = pygame.transform.scale(
-            self.image, (self.width, self.height))
-        self.surface.blit(self.image, (0, 0))
+        surface.blit(self.image, self.rect)
 
     def bomb_delay(self):
         """
@@ -478,11 +652,20 @@ class Bomb(Drawable):
         self.delete_marks = delete_marks
 
 
-class Cube(Drawable):
-    def __init__(self, x, y, width=50, height=50, i=0, j=0):
+class Cube:
+    __slots__ = ('image', 'rect', 'i', 'j')
+
+    # Looks of a cube, one is picked at random for each cube
+    paths = ['images/cheese_brick.png', 'images/dirt_brick.png',
+             'images/sweet_brick.png', 'images/ice_cube.png']
+
+    def __init__(self, x, y, width=50, height=50, i=0, j=0, rng=random):
         """
         Initialize a cube object.
 
+        Cubes only reference the shared cached image of their look, so a full
+        board holds four surfaces however many cubes are on it.
+
         Args:
             x: x-coordinate of the cube
             y: y-coordinate of the cube
@@ -490,27 +673,21 @@ class Cube(Drawable):
             height: height of the cube (default: 50)
             i: row index of the cube's position
             j: column index of the cube's position
+            rng: random number generator choosing the cube's look (default: the random module)
         """
-        super().__init__(width, height, x, y)
-        self.image = None
-        paths = ['images/cheese_brick.png', 'images/dirt_brick.png',
-                 'images/sweet_brick.png', 'images/ice_cube.png']
-        image_file = random.choice(paths)
-        self.load_image(image_file)
+        self.image = images.load(rng.choice(self.paths), (width, height))
+        self.rect = pygame.Rect(x, y, width, height)
         self.i = i
         self.j = j
 
-    def load_image(self, image_file):
+    def draw_on(self, surface):
         """
-        Load the cube image and scale it to the specified width and height.
+        Draw the cube on the specified surface.
 
         Args:
-            image_file: path to the cube image file
+            surface: surface to draw the cube on
         """
-        self.image = pygame.image.load(image_file)
-        self.image = pygame.transform.scale(
-            self.image, (self.width, self.height))
-        self.surface.blit(self.image, (0, 0))
+        surface.blit(self.image, self.rect)
 
 
 class Profile(Drawable):
@@ -536,9 +713,7 @@ class Profile(Drawable):
         Update the profile image based on the player identifier.
         """
         image_file = 'images/hero{}.png'.format(self.player)
-        self.image = pygame.image.load(image_file)
-        self.image = pygame.transform.scale(
-            self.image, (int(self.width * 0.06674), int(self.height * 0.1129)))
+        self.image = images.load(image_file, (int(self.width * 0.06674), int(self.height * 0.1129)))
         self.rect = self.image.get_rect()
         self.rect.x = self.x_pos
         self.rect.y = self.y_pos
@@ -578,11 +753,8 @@ class ProfilePowerUps(Drawable):
         Update the power-up image based on the power-up type.
         """
         image_file = 'images/shield.png' if self.power_up == 1 else 'images/blank.png'
-        self.image = pygame.image.load(image_file)
-        self.image = pygame.transform.scale(
-            self.image, (int(self.width * 0.0278), int(self.height * 0.0448)))
-        self.rect.x = self.x_pos
-        self.rect.y = self.y_pos
+        self.image = images.load(image_file, (int(self.width * 0.0278), int(self.height * 0.0448)))
+        self.rect = self.image.get_rect(x=self.x_pos, y=self.y_pos)
 
     def add_shield(self):
         """
@@ -619,7 +791,7 @@ class Score:
             player: player identifier
         """
         self.score = 0
-        self.font = pygame.font.SysFont('monospace', int(width * 0.02))
+        self.font_size = int(width * 0.02)
         self.position = (width * 0.045, height * 0.5197 +
                          (player - 1) * height * 0.307)
 
@@ -630,5 +802,25 @@ class Score:
         Args:
             surface: surface to draw on
         """
-        text = self.font.render(str(self.score), True, (0, 0, 0))
-        surface.blit(text, self.position)
+        surface.blit(self.image, self.rect)
+
+    @property
+    def font(self):
+        """
+        Font of the score, created on first use through the font cache.
+        """
+        return fonts.load('monospace', self.font_size)
+
+    @property
+    def image(self):
+        """
+        Rendered score, shared through the text cache.
+        """
+        return texts.render(self.font, str(self.score), (0, 0, 0))
+
+    @property
+    def rect(self):
+        """
+        Region covered by the rendered score.
+        """
+        return self.image.get_rect(topleft=self.position)
@@ -0,0 +1,515 @@
+import math
+import random
+import numpy as np
+from locks import CountingLock
+
+# Cell type codes stored in BoardGrid
+EMPTY = 0
+CUBE = 1
+BOMB = 2
+ITEM = 3
+
+# Largest number of rows or columns of a board
+MAX_BOARD_SIZE = 256
+
+
+class BoardGrid:
+    def __init__(self, rows, columns):
+        """
+        Initialize the board state as a rows x columns array of cell type codes.
+
+        Writes are guarded by one lock per row, so threads touching different
+        rows never wait for each other, plus a short lock around the free list.
+
+        Args:
+            rows: number of rows of the board
+            columns: number of columns of the board
+        """
+        self.cells = np.zeros((rows, columns), dtype=np.uint8)
+
+        # Empty cells as flat ids (i * columns + j) in a list with swap-remove,
+        # and the position of each id in that list (-1 when occupied)
+        self.free = list(range(rows * columns))
+        self.free_position = list(range(rows * columns))
+
+        # Striped locks, one per row, and the lock of the free list
+        self.row_locks = [CountingLock() for _ in range(rows)]
+        self.free_lock = CountingLock()
+
+    @property
+    def rows(self):
+        """
+        Number of rows of the board.
+        """
+        return self.cells.shape[0]
+
+    @property
+    def columns(self):
+        """
+        Number of columns of the board.
+        """
+        return self.cells.shape[1]
+
+    def get(self, i, j):
+        """
+        Get the type code of a cell.
+
+        Args:
+            i: row index
+            j: column index
+
+        Returns:
+            int: EMPTY, CUBE, BOMB or ITEM
+        """
+        return int(self.cells[i, j])
+
+    def set(self, i, j, code):
+        """
+        Set the type code of a cell.
+
+        Args:
+            i: row index
+            j: column index
+            code: EMPTY, CUBE, BOMB or ITEM
+        """
+        lock = self.row_locks[i]
+        lock.acquire()
+        self.write(i, j, code)
+        lock.release()
+
+    def claim(self, i, j, code):
+        """
+        Atomically occupy a cell if it is still empty.
+
+        Callers pick a cell without holding any lock and claim it here, so a
+        cell taken by another thread in between is detected instead of overwritten.
+
+        Args:
+            i: row index
+            j: column index
+            code: CUBE, BOMB or ITEM
+
+        Returns:
+            bool: True if the cell was empty and now holds code
+        """
+        lock = self.row_locks[i]
+        lock.acquire()
+        claimed = self.cells[i, j] == EMPTY
+        if claimed:
+            self.write(i, j, code)
+        lock.release()
+        return claimed
+
+    def write(self, i, j, code):
+        """
+        Set the type code of a cell, the caller holds the lock of row i.
+
+        Args:
+            i: row index
+            j: column index
+            code: EMPTY, CUBE, BOMB or ITEM
+        """
+        cell = i * self.columns + j
+        self.free_lock.acquire()
+        if code == EMPTY:
+            self.mark_free(cell)
+        else:
+            self.mark_occupied(cell)
+        self.free_lock.release()
+        self.cells[i, j] = code
+
+    def clear(self, i, j):
+        """
+        Mark a cell as empty.
+
+        Args:
+            i: row index
+            j: column index
+        """
+        self.set(i, j, EMPTY)
+
+    def mark_free(self, cell):
+        """
+        Add a cell to the free list if it is not there yet.
+
+        Args:
+            cell: flat cell id
+        """
+        if self.free_position[cell] == -1:
+            self.free_position[cell] = len(self.free)
+            self.free.append(cell)
+
+    def mark_occupied(self, cell):
+        """
+        Remove a cell from the free list by swapping it with the last entry.
+
+        Args:
+            cell: flat cell id
+        """
+        position = self.free_position[cell]
+        if position != -1:
+            last = self.free.pop()
+            if last != cell:
+                self.free[position] = last
+                self.free_position[last] = position
+            self.free_position[cell] = -1
+
+    def free_count(self):
+        """
+        Count the empty cells.
+
+        Returns:
+            int: number of empty cells
+        """
+        return len(self.free)
+
+    def random_free_cell(self, accept=None, attempts=8, rng=random):
+        """
+        Pick a random empty cell in constant time.
+
+        Up to attempts cells are drawn from the free list until one passes
+        accept, so callers with extra placement rules can fall back to a
+        vectorized query when the rules reject most of the free cells.
+
+        Args:
+            accept: function (i, j) -> bool for extra placement rules (optional)
+            attempts: number of draws before giving up (default: 8)
+            rng: random number generator (default: the random module)
+
+        Returns:
+            tuple: (i, j) of the cell, or None if the board is full or no draw was accepted
+        """
+        for _ in range(attempts):
+            self.free_lock.acquire()
+            cell = self.free[rng.randrange(len(self.free))] if self.free else None
+            self.free_lock.release()
+            if cell is None:
+                return None
+            i, j = divmod(cell, self.columns)
+            if accept is None or accept(i, j):
+                return i, j
+        return None
+
+    def reset(self):
+        """
+        Mark every cell as empty.
+        """
+        for lock in self.row_locks:
+            lock.acquire()
+        self.free_lock.acquire()
+        self.cells.fill(EMPTY)
+        self.free = list(range(self.cells.size))
+        self.free_position = list(range(self.cells.size))
+        self.free_lock.release()
+        for lock in self.row_locks:
+            lock.release()
+
+    def locks(self):
+        """
+        Get every lock guarding the grid.
+
+        Returns:
+            list: the row locks and the free list lock
+        """
+        return [*self.row_locks, self.free_lock]
+
+    def free_cells(self, exclude=None):
+        """
+        Get all empty cells.
+
+        Args:
+            exclude: boolean array of the board's shape marking cells to skip (optional)
+
+        Returns:
+            numpy.ndarray: (n, 2) array of (i, j) indices
+        """
+        mask = self.cells == EMPTY
+        if exclude is not None:
+            mask &= ~exclude
+        return np.argwhere(mask)
+
+    def free_cells_away_from(self, positions, distance=1, exclude=None):
+        """
+        Get the empty cells further than distance (in rows or columns) from every position.
+
+        Args:
+            positions: (i, j) cells to keep away from, e.g. the heroes' cells
+            distance: number of cells around each position that are skipped (default: 1)
+            exclude: boolean array of the board's shape marking cells to skip (optional)
+
+        Returns:
+            numpy.ndarray: (n, 2) array of (i, j) indices
+        """
+        blocked = np.zeros(self.cells.shape, dtype=bool)
+        if exclude is not None:
+            blocked |= exclude
+        for i, j in positions:
+            blocked[max(i - distance, 0):max(i + distance + 1, 0),
+                    max(j - distance, 0):max(j + distance + 1, 0)] = True
+        return self.free_cells(blocked)
+
+    def blast_cells(self, i, j, radius, blocking=CUBE):
+        """
+        Get the cells reached by an explosion at (i, j).
+
+        The blast spreads in the four directions up to radius cells, stopping at
+        the board edge and including the first blocking cell in each direction.
+
+        Args:
+            i: row index of the explosion
+            j: column index of the explosion
+            radius: number of cells the blast reaches in each direction
+            blocking: type code that stops the blast (default: CUBE)
+
+        Returns:
+            list: (i, j) tuples of the cells in the blast, the center first
+        """
+        cells = [(i, j)]
+        arms = (
+            (self.cells[i + 1:i + radius + 1, j], 1, 0),
+            (self.cells[max(i - radius, 0):i, j][::-1], -1, 0),
+            (self.cells[i, j + 1:j + radius + 1], 0, 1),
+            (self.cells[i, max(j - radius, 0):j][::-1], 0, -1),
+        )
+        for arm, di, dj in arms:
+            arm = arm.tolist()
+            length = arm.index(blocking) + 1 if blocking in arm else len(arm)
+            cells.extend((i + di * step, j + dj * step) for step in range(1, length + 1))
+        return cells
+
+
+class GridIndex:
+    def __init__(self, rows, columns):
+        """
+        Initialize a spatial index mapping board cells to the entities occupying them.
+
+        Args:
+            rows: number of rows of the board
+            columns: number of columns of the board
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cells = [[[] for j in range(columns)] for i in range(rows)]
+
+    def add(self, entity):
+        """
+        Register an entity in the cell given by its i and j attributes.
+
+        Args:
+            entity: object with i (row) and j (column) attributes
+        """
+        self.cells[entity.i][entity.j].append(entity)
+
+    def remove(self, entity):
+        """
+        Remove an entity from its cell, ignoring entities that are not indexed.
+
+        Args:
+            entity: object with i (row) and j (column) attributes
+        """
+        cell = self.cells[entity.i][entity.j]
+        if entity in cell:
+            cell.remove(entity)
+
+    def at(self, i, j):
+        """
+        Get the entities in a cell.
+
+        Args:
+            i: row index
+            j: column index
+
+        Returns:
+            list: entities in the cell, empty for cells outside the board
+        """
+        if 0 <= i < self.rows and 0 <= j < self.columns:
+            return self.cells[i][j]
+        return []
+
+    def around(self, i0, j0, i1, j1):
+        """
+        Yield the entities in the cells spanned by (i0, j0)-(i1, j1) and their neighbors.
+
+        Args:
+            i0: first row of the span
+            j0: first column of the span
+            i1: last row of the span
+            j1: last column of the span
+        """
+        return self.within(i0 - 1, j0 - 1, i1 + 1, j1 + 1)
+
+    def within(self, i0, j0, i1, j1):
+        """
+        Yield the entities in the cells spanned by (i0, j0)-(i1, j1), row by row.
+
+        Args:
+            i0: first row of the span, clamped to the board
+            j0: first column of the span, clamped to the board
+            i1: last row of the span, clamped to the board
+            j1: last column of the span, clamped to the board
+        """
+        j0 = max(j0, 0)
+        j1 = min(j1 + 1, self.columns)
+        for row in self.cells[max(i0, 0):min(i1 + 1, self.rows)]:
+            for cell in row[j0:j1]:
+                yield from cell
+
+    def clear(self):
+        """
+        Remove every entity from the index.
+        """
+        for row in self.cells:
+            for cell in row:
+                cell.clear()
+
+    def __len__(self):
+        """
+        Count the indexed entities.
+
+        Returns:
+            int: number of entities in the index
+        """
+        return sum(len(cell) for row in self.cells for cell in row)
+
+
+class GridGeometry:
+    def __init__(self, width, height, rows, columns, view_rows=None, view_columns=None):
+        """
+        Precompute the mapping between board cells and window pixels.
+
+        The playing field starts at 25% of the window width and 4% of its height
+        and spans 70% of the width and 92.65% of the height. The cells shown at
+        once, the whole board by default, are scaled to fit it. On boards with
+        more rows or columns than the view the cells keep that size, the board
+        extends past the field and a camera scrolls over it, entity positions
+        stay in these board pixels. Cell origins and the cell of every pixel are
+        stored in tables, so conversions are lookups.
+
+        Args:
+            width: width of the window in pixels
+            height: height of the window in pixels
+            rows: number of rows of the board
+            columns: number of columns of the board
+            view_rows: number of rows shown at once, at most rows (default: all of them)
+            view_columns: number of columns shown at once, at most columns (default: all of them)
+        """
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.columns = columns
+        self.view_rows = min(view_rows or rows, rows)
+        self.view_columns = min(view_columns or columns, columns)
+        self.left = width * 0.25
+        self.top = height * 0.04
+        self.column_width = width * 0.7 / self.view_columns
+        self.row_height = height * 0.9265 / self.view_rows
+
+        # Bottom-right corner of the visible field, and limit of the area heroes move in which
+        # extends past the field by the rows and columns out of view
+        self.view_right = width - width * 0.0484
+        self.view_bottom = height - height * 0.032
+        self.right = self.view_right + self.column_width * (columns - self.view_columns)
+        self.bottom = self.view_bottom + self.row_height * (rows - self.view_rows)
+
+        # Size in whole pixels of the field the camera shows, heroes stay within it of each other
+        self.view_width = math.ceil(self.view_right) - math.floor(self.left)
+        self.view_height = math.ceil(self.view_bottom) - math.floor(self.top)
+
+        # Size of the images drawn in a cell and of the delete marks, at least one pixel on large boards
+        self.cell_width = max(math.floor(width * 0.7 / self.view_columns), 1)
+        self.cell_height = max(math.floor(height * 0.9265 / self.view_rows), 1)
+        self.mark_size = (max(math.floor(width * 0.65 / self.view_rows), 1),
+                          max(math.floor(height * 0.91 / self.view_columns), 1))
+
+        # Pixel position of the top-left corner of each column and row
+        self.x_origins = [math.ceil(self.left + math.ceil(self.column_width * j)) for j in range(columns)]
+        self.y_origins = [math.ceil(self.top + math.ceil(self.row_height * i)) for i in range(rows)]
+
+        # Column of every x pixel and row of every y pixel of the window and of the board past it
+        self.column_of = [self.compute_column(x) for x in range(max(width, math.ceil(self.right) + 1))]
+        self.row_of = [self.compute_row(y) for y in range(max(height, math.ceil(self.bottom) + 1))]
+
+    @property
+    def scrolls(self):
+        """
+        True if the board has more rows or columns than the view.
+        """
+        return self.view_rows < self.rows or self.view_columns < self.columns
+
+    def compute_column(self, x):
+        """
+        Compute the column containing an x-coordinate.
+
+        Args:
+            x: x-coordinate in pixels
+
+        Returns:
+            int: column index, outside 0..columns-1 for pixels left or right of the board
+        """
+        return math.floor((x - self.left) / self.column_width)
+
+    def compute_row(self, y):
+        """
+        Compute the row containing a y-coordinate.
+
+        Args:
+            y: y-coordinate in pixels
+
+        Returns:
+            int: row index, outside 0..rows-1 for pixels above or below the board
+        """
+        return math.floor((y - self.top) / self.row_height)
+
+    def column_at(self, x):
+        """
+        Look up the column containing an x-coordinate.
+
+        Args:
+            x: x-coordinate in pixels
+
+        Returns:
+            int: column index
+        """
+        if type(x) is int and 0 <= x < len(self.column_of):
+            return self.column_of[x]
+        return self.compute_column(x)
+
+    def row_at(self, y):
+        """
+        Look up the row containing a y-coordinate.
+
+        Args:
+            y: y-coordinate in pixels
+
+        Returns:
+            int: row index
+        """
+        if type(y) is int and 0 <= y < len(self.row_of):
+            return self.row_of[y]
+        return self.compute_row(y)
+
+    def cell_at(self, x, y):
+        """
+        Look up the cell containing a pixel.
+
+        Args:
+            x: x-coordinate in pixels
+            y: y-coordinate in pixels
+
+        Returns:
+            tuple: (i, j) row and column indices
+        """
+        return self.row_at(y), self.column_at(x)
+
+    def origin(self, i, j):
+        """
+        Get the pixel position of a cell's top-left corner.
+
+        Args:
+            i: row index
+            j: column index
+
+        Returns:
+            tuple: (x, y) in pixels
+        """
+        return self.x_origins[j], self.y_origins[i]
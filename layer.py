@@ -0,0 +1,157 @@
+class Layer:
+    def __init__(self, index=None, max_log=4096):
+        """
+        Initialize an ordered collection of entities drawn together.
+
+        Entities of a layer keep their image and position while they are in it,
+        like cubes, bombs, items and delete marks. Adding and removing are
+        constant time, and the blit sequence and covered regions are cached
+        until the membership changes, so an unchanged layer costs nothing to
+        check and is drawn with a single Surface.blits call.
+
+        Every addition and removal is also logged with its image and region, so
+        the board and pre-rendered layers can catch up with the changes since a
+        version they saw instead of comparing every entity, which keeps large
+        boards cheap to update.
+
+        Args:
+            index: GridIndex kept in sync with the layer, to look up its entities by cell (optional)
+            max_log: number of logged changes kept, older ones are dropped in halves (default: 4096)
+        """
+        self.entities = {}
+        self.index = index
+        self.version = 0
+        self.sequence = None
+        self.covered = None
+
+        # (added, image, (x, y, width, height)) of each change, the first one made at version log_start
+        self.max_log = max_log
+        self.log = []
+        self.log_start = 0
+
+    def add(self, entity):
+        """
+        Add an entity on top of the layer.
+
+        Args:
+            entity: object with image and rect attributes
+        """
+        self.entities[entity] = None
+        if self.index is not None:
+            self.index.add(entity)
+        self.changed([(True, entity.image, tuple(entity.rect))])
+
+    def remove(self, entity):
+        """
+        Remove an entity from the layer.
+
+        Args:
+            entity: an entity of the layer
+
+        Raises:
+            KeyError: if the entity is not in the layer
+        """
+        del self.entities[entity]
+        if self.index is not None:
+            self.index.remove(entity)
+        self.changed([(False, entity.image, tuple(entity.rect))])
+
+    def discard(self, entity):
+        """
+        Remove an entity from the layer if it is there.
+
+        Args:
+            entity: object to remove
+        """
+        if entity in self.entities:
+            self.remove(entity)
+
+    def clear(self):
+        """
+        Remove every entity.
+        """
+        changes = [(False, entity.image, tuple(entity.rect)) for entity in self.entities]
+        self.entities.clear()
+        if self.index is not None:
+            self.index.clear()
+        self.changed(changes)
+
+    def changed(self, changes):
+        """
+        Log changes of the membership and drop the cached blit sequence and regions.
+
+        Args:
+            changes: (added, image, region) of every entity added or removed, each one is a new version
+        """
+        self.version += len(changes)
+        self.log.extend(changes)
+        if len(self.log) > self.max_log:
+            dropped = len(self.log) // 2
+            del self.log[:dropped]
+            self.log_start += dropped
+        self.sequence = None
+        self.covered = None
+
+    def changes_since(self, version):
+        """
+        Get the changes made after a version.
+
+        Args:
+            version: a previous value of self.version
+
+        Returns:
+            list: (added, image, (x, y, width, height)) of each change in order,
+                or None if some of them were dropped from the log
+        """
+        if version < self.log_start:
+            return None
+        return self.log[version - self.log_start:]
+
+    def blits(self):
+        """
+        Get the (image, rect) pairs of the entities in drawing order.
+
+        Returns:
+            list: blit sequence for pygame.Surface.blits
+        """
+        if self.sequence is None:
+            self.sequence = [(entity.image, entity.rect) for entity in self.entities]
+        return self.sequence
+
+    def regions(self):
+        """
+        Get the entities, images and regions drawn by the layer.
+
+        Returns:
+            frozenset: (id of the entity, id of the image, (x, y, width, height)) tuples
+        """
+        if self.covered is None:
+            self.covered = frozenset((id(entity), id(entity.image), tuple(entity.rect)) for entity in self.entities)
+        return self.covered
+
+    def __iter__(self):
+        """
+        Iterate over the entities in drawing order.
+        """
+        return iter(self.entities)
+
+    def __len__(self):
+        """
+        Count the entities.
+
+        Returns:
+            int: number of entities in the layer
+        """
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        """
+        Check if an entity is in the layer.
+
+        Args:
+            entity: object to look for
+
+        Returns:
+            bool: True if the entity is in the layer
+        """
+        return entity in self.entities
@@ -0,0 +1,55 @@
+import threading as th
+import time
+
+
+class CountingLock:
+    def __init__(self):
+        """
+        Initialize a lock that counts how often and how long threads wait for it.
+
+        An uncontended acquire costs one non-blocking attempt. Only when that
+        fails is the wait timed, so the counters show real contention.
+        """
+        self.lock = th.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def acquire(self):
+        """
+        Acquire the lock, blocking until it is free.
+
+        Returns:
+            bool: always True
+        """
+        if not self.lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self.lock.acquire()
+            # The counters are only updated while holding the lock
+            self.waits += 1
+            self.wait_time += time.perf_counter() - start
+        return True
+
+    def release(self):
+        """
+        Release the lock.
+        """
+        self.lock.release()
+
+    def __enter__(self):
+        """
+        Acquire the lock at the start of a with block.
+
+        Returns:
+            CountingLock: the lock
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Release the lock at the end of a with block.
+
+        Args:
+            *exc_info: exception raised in the block, if any
+        """
+        self.release()
@@ -1,26 +1,39 @@
-import math
+import argparse
+import os
+import collections
 import pygame
 import pygame.locals
-import threading as th
-from concurrent.futures import ThreadPoolExecutor
-import time
-import random
-import sys
-from board import *
-from drawable import *
+from board import Board, Background, StaticLayer, FieldLayer
+from drawable import (Hero, Heart, Button, Timer, Text, TextField, ProfilerOverlay, Profile, ProfilePowerUps,
+                      Score)
 from collisions import Collisions, check_collision
 from spawn import Spawn
+from assets import images, Preloader, GAME_IMAGES, CELL_IMAGES
+from world import World
+from grid import MAX_BOARD_SIZE
+from scheduler import Scheduler
+from profiler import FrameProfiler
+from replay import Recorder
+from controls import (DROP_BOMB, MOVES, HERO1_KEYS, HERO2_KEYS,
+                      KeyboardController, RandomController)
 
-# Create a lock object for synchronization
-lock = th.Lock()
+# Longest real time simulated in one frame, so a stall does not trigger an endless catch-up
+MAX_FRAME_TIME = 0.25
 
-# Create a 2-dimensional list to represent cord_list
-# with dimensions 16x20, initialized with zeros
-cord_list = [[0 for i in range(20)] for j in range(16)]
+# Distance in pixels a hero moves per tick
+HERO_SPEED = 1.49
+
+# Size of the heroes in pixels, they shrink to fit between cubes on boards with smaller cells
+HERO_SIZE = 30
+
+# Seconds between spawning cubes and between spawning items
+SPAWN_INTERVAL = 5
 
 
 class Game(Collisions, Spawn):
-    def __init__(self, width, height, game_time):
+    def __init__(self, width, height, game_time, tick_rate=100, fps=60, headless=False, controllers=None,
+                 seed=None, trace_file=None, record_file=None, fast_start=False, rows=16, columns=20,
+                 view_rows=None, view_columns=None):
         """
         Initialize the game object.
 
@@ -28,31 +41,136 @@ class Game(Collisions, Spawn):
             width: width of the game window
             height: height of the game window
             game_time: total game time in seconds
+            tick_rate: simulation ticks per second (default: 100)
+            fps: maximum number of rendered frames per second (default: 60)
+            headless: run without a window and without rendering (default: False)
+            controllers: pair of controllers giving the input of hero 1 and hero 2
+                (default: keyboard, or random players when headless)
+            seed: seed of the random number generator placing cubes and items (optional)
+            trace_file: write the per-frame phase timings to this CSV or JSON file when the game quits (optional)
+            record_file: record the seed and the input of both heroes to this replay file (optional)
+            fast_start: only load what the start screen shows and load the rest in a background thread,
+                the match objects are created when the start screen is left (default: False)
+            rows: number of rows of the board, up to MAX_BOARD_SIZE (default: 16)
+            columns: number of columns of the board, up to MAX_BOARD_SIZE (default: 20)
+            view_rows: number of rows shown at once, the view scrolls with the heroes over larger boards
+                (default: all of them)
+            view_columns: number of columns shown at once (default: all of them)
+
+        Raises:
+            ValueError: if the board has fewer than 2 or more than MAX_BOARD_SIZE rows or columns,
+                or the view has fewer than 1 or more rows or columns than the board
         """
+        if not (2 <= rows <= MAX_BOARD_SIZE and 2 <= columns <= MAX_BOARD_SIZE):
+            raise ValueError(f"the board must have 2 to {MAX_BOARD_SIZE} rows and columns, not {rows}x{columns}")
+        if not ((view_rows is None or 1 <= view_rows <= rows)
+                and (view_columns is None or 1 <= view_columns <= columns)):
+            raise ValueError(f"the view must have 1 to {rows} rows and 1 to {columns} columns, "
+                             f"not {view_rows}x{view_columns}")
+
         self.width = width
         self.height = height
         self.game_time = game_time
-        self.board_elements = None
-
-        # Initialize Pygame
+        self.tick_rate = tick_rate
+        self.tick_length = 1 / tick_rate
+        self.fps = fps
+        self.headless = headless
+        self.seed = seed
+        self.fast_start = fast_start
+        self.ticks = 0
+
+        # Timed game events (countdown, spawning) fired from the tick loop
+        self.scheduler = Scheduler()
+
+        if controllers is None:
+            if headless:
+                controllers = (RandomController(), RandomController())
+            else:
+                controllers = (KeyboardController(HERO1_KEYS), KeyboardController(HERO2_KEYS))
+        self.controllers = controllers
+
+        # Frame limiter and the duration of recent frames in milliseconds
+        self.clock = pygame.time.Clock()
+        self.frame_times = collections.deque(maxlen=300)
+
+        # Time spent in each phase of a frame and waiting for board locks, shown with F3, and kept for every
+        # frame only to be saved on exit
+        self.profiler = FrameProfiler(max_trace=100000 if trace_file else 0)
+        self.trace_file = trace_file
+        self.show_profiler = False
+
+        # Set when the restart button is clicked, run then resets the game in place for a new match
+        self.restart = False
+
+        # Initialize Pygame, without a real video device when headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
         pygame.init()
 
+        # Create the state of the match: board cells, entities and their indexes
+        self.world = World(rows, columns, seed)
+
+        # Create game board first so cached images can be converted to the display format
+        self.board = Board(width, height, rows=self.world.rows, columns=self.world.columns, headless=headless,
+                           view_rows=view_rows, view_columns=view_columns)
+
+        # Cells at and next to the heroes' starting corners, cubes never spawn there
+        self.reserved = self.reserved_cells()
+
+        # Record the input of every tick, so the match can be replayed from its seed
+        self.record_file = record_file
+        self.recorder = Recorder(self) if record_file else None
+
+        # Create the start screen, the only part of the game drawn before the match assets are needed
+        self.background_start = Background('images/Start_screen.png', width, height)
+        self.start_button = Button(width, height, height * 0.844, "images/Start.png")
+        self.text_field = TextField((width * 0.17, height * 0.672, width * 0.195, height * 0.0645), width, '#7843E6')
+        self.text_field2 = TextField((width * 0.645, height * 0.672, width * 0.195, height * 0.0645), width, '#FF0099')
+        self.start_elements = [self.background_start, self.start_button, self.text_field, self.text_field2]
+
+        # Decode every other image once and scale the ones drawn in cells, later constructors only hit the cache
+        geometry = self.board.geometry
+        cell_size = (geometry.cell_width, geometry.cell_height)
+        assets = [*GAME_IMAGES, *[(path, cell_size) for path in CELL_IMAGES],
+                  ('images/delete_mark.png', geometry.mark_size)]
+        # Set by create_match, the match objects are built once and reset in place for later matches
+        self.match_created = False
+        if fast_start:
+            # Load while the start screen is shown, the preloader is dropped once the match objects exist
+            self.preloader = Preloader(assets).start()
+        else:
+            self.preloader = None
+            images.preload(assets)
+            self.create_match()
+
+    def create_match(self):
+        """
+        Create the heroes, the displays of the match and the layers drawn during it.
+
+        With fast_start this first waits for the preloader, the images are then already in the cache.
+        """
+        if self.preloader is not None:
+            self.preloader.wait()
+            self.preloader = None
+        self.match_created = True
+        width = self.width
+        height = self.height
+
         # Create background objects
-        self.background_start = Background(
-            'images/Start_screen.png', width, height)
         self.background = Background(
             'images/background.png', width, height)
         self.background2 = Background(
             'images/blank.png', width, height)
+        self.board.background = self.background
 
-        # Create game board
-        self.board = Board(width, height, background=self.background)
-
-        # Create hero objects
-        self.hero1 = Hero(self.board, image_file='images/hero1.png', width=30,
-                          height=30, x=width - width * 0.0734, y=height * 0.04, name="Player 1")
-        self.hero2 = Hero(self.board, image_file='images/hero2.png', width=30, height=30,
-                          x=width * 0.25, y=height * 0.04, name="Player 2")
+        # Create hero objects in the top corners of the first view, which is the whole board unless it scrolls,
+        # smaller than a cell so they fit between cubes
+        geometry = self.board.geometry
+        hero_size = min(HERO_SIZE, max(round(min(geometry.cell_width, geometry.cell_height) * 0.9), 1))
+        self.hero1 = Hero(self.board, image_file='images/hero1.png', width=hero_size, height=hero_size,
+                          x=geometry.view_right - hero_size, y=geometry.top, name="Player 1")
+        self.hero2 = Hero(self.board, image_file='images/hero2.png', width=hero_size, height=hero_size,
+                          x=geometry.left, y=geometry.top, name="Player 2")
 
         # Create heart objects for each player
         hearts1 = [Heart(width=width, height=height, live_type=True,
@@ -63,12 +181,7 @@ class Game(Collisions, Spawn):
         self.hero2.set_hearts(hearts2)
 
         # Create timer object
-        self.timer = Timer(width, game_time)
-
-        # Create empty lists for items, bombs, and cubes
-        self.items = []
-        self.bombs = []
-        self.cubes = []
+        self.timer = Timer(width, height, self.game_time)
 
         # Create score objects for each player
         self.score1 = Score(width, height, 1)
@@ -100,22 +213,40 @@ class Game(Collisions, Spawn):
         self.hero2_name = Text(width * 0.02, "Player 2",
                                width * 0.045, height * 0.63)
 
-        # Create button objects
+        # Create the button shown when the match is over
         self.restart_button = Button(width, height, height * 0.81, "images/restart.png")
-        self.start_button = Button(width, height, height * 0.844, "images/start.png")
 
-        # Create text input object
-        self.text_field = TextField((width * 0.17, height * 0.672, width * 0.195, height * 0.0645), width, '#7843E6')
-        self.text_field2 = TextField((width * 0.645, height * 0.672, width * 0.195, height * 0.0645), width, '#FF0099')
+        # Create the profiler overlay, drawn when toggled with F3
+        self.profiler_overlay = ProfilerOverlay(self.profiler, width)
+
+        # Background and cubes pre-rendered into one surface, updated when cubes spawn or explode
+        self.terrain = StaticLayer(self.background, self.world.cubes)
+
+        # Layers drawn during a match, built once. The heroes and the displays are compared with the
+        # previous frame one by one, the other layers only when an entity was added or removed
+        self.layers = [
+            self.terrain,
+            FieldLayer(self.hero1, self.hero2),
+            self.world.items,
+            self.world.bombs,
+            self.world.marks,
+            (*self.hero1.hearts, *self.hero2.hearts, self.timer, self.score1, self.score2, self.prof1, self.prof2,
+             self.profitems1, self.profitems2, self.hero1_name, self.hero2_name),
+        ]
+        self.profiler_layers = [*self.layers, (self.profiler_overlay,)]
 
     def start_screen(self):
         """
         Display the start screen with a button to start the game.
+
+        Returns:
+            True if the window was closed, False when the start button was clicked.
         """
 
         # Draw the elements on the screen
-        elements = [self.background_start, self.start_button, self.text_field, self.text_field2]
-        self.board.draw(*elements)
+        elements = self.start_elements
+        self.board.invalidate()
+        self.board.draw(elements)
 
         while True:
             for event in pygame.event.get():
@@ -123,182 +254,340 @@ class Game(Collisions, Spawn):
                 self.text_field2.handle_event(event)
 
                 if event.type == pygame.locals.QUIT:
-                    # Quit the game
-                    pygame.quit()
-                    sys.exit()
+                    # Quit the game, run saves the trace and quits pygame
+                    return True
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     # Check if the left mouse button was clicked on the start button
-                    if self.start_button.rect.collidepoint(pygame.mouse.get_pos()):
-                        # Set the names of the heroes based on the text in the text fields
+                    if self.start_button.rect.collidepoint(event.pos):
+                        # Finish loading the match the first time, then name the heroes after the text in the
+                        # text fields
+                        if not self.match_created:
+                            self.create_match()
                         self.hero1.name = self.text_field.text
                         self.hero2.name = self.text_field2.text
                         self.hero1_name.text = self.text_field.text
                         self.hero2_name.text = self.text_field2.text
-                        return
-
-            # Redraw the elements on the screen
-            self.board.draw(*elements)
+                        return False
 
-            # Update the display
-            pygame.display.flip()
+            # Redraw the changed elements on the screen
+            self.board.draw(elements)
+            self.clock.tick(self.fps)
 
     def reset_game(self):
         """
-        Reset the game to its initial state.
-        """
-        self.__init__(self.width, self.height, self.game_time)
+        Reset the game in place for a new match.
 
-        # Reset cord_list and other list
-        self.items = []
-        self.bombs = []
-        self.cubes = []
-        lock.acquire()
-        global cord_list
-        cord_list = [[0 for i in range(20)] for j in range(16)]
-        lock.release()
-        # Prepare and run the game again
-        game.run()
+        The window, the loaded images and fonts and every drawable are kept,
+        only the state of the match is reset, so a restart costs far less than
+        starting the game.
+        """
+        # Drop the pending events and the entities of the finished match
+        self.scheduler.reset()
+        self.world.reset()
+        self.world.reseed(self.seed)
+        self.ticks = 0
+        self.frame_times.clear()
+        self.recorder = Recorder(self) if self.record_file else None
+
+        # Put the heroes back in their corners and reset the displays
+        self.hero1.reset()
+        self.hero2.reset()
+        self.timer.reset()
+        self.score1.score = 0
+        self.score2.score = 0
+        self.profitems1.remove_shield()
+        self.profitems2.remove_shield()
+
+        # Scroll back to the first view, where the heroes start
+        if self.board.camera is not None:
+            self.board.camera.move_to(0, 0)
+
+        # A game over event may still be queued when both heroes died at once
+        pygame.event.clear(pygame.USEREVENT)
+        self.restart = False
+        self.board.invalidate()
 
     def prepare(self):
         """
-        Prepare the game by spawning cubes.
+        Prepare the game by spawning cubes on about 60% of the board and scheduling the timed events.
+        """
+        random_number = int(self.world.rows * self.world.columns * self.world.rng.uniform(0.6, 0.65))
+        self.spawn_cubes(random_number)
+
+        # Count down every second, spawn a cube and an item every SPAWN_INTERVAL seconds
+        self.scheduler.schedule_every(self.tick_rate, self.timer.tick)
+        self.scheduler.schedule_every(SPAWN_INTERVAL * self.tick_rate, self.spawn_cubes)
+        self.scheduler.schedule_every(SPAWN_INTERVAL * self.tick_rate, self.spawn_item)
+
+    def run(self, show_start_screen=True):
         """
-        random_number = random.randint(300, 350)
-        self.spawn_cubes(random_number, False)
+        Run the game loop, one match after another until the players quit.
 
-    def run(self):
+        Args:
+            show_start_screen: wait for the start button before each match (default: True)
         """
-        Run the game loop.
+        while True:
+            # Display the start screen, closing the window there quits before the match starts
+            if show_start_screen and self.start_screen():
+                break
+
+            # Create the match if the start screen did not, because it was skipped
+            if not self.match_created:
+                self.create_match()
+
+            # Prepare and play the match, then reset it in place if the players asked for another one
+            self.prepare()
+            self.play()
+            if not self.restart:
+                # Save the recording of an unfinished match
+                self.save_recording()
+                break
+            self.reset_game()
+
+        # Save the phase timings of every match for offline analysis
+        if self.trace_file:
+            self.profiler.dump(self.trace_file)
+
+        # Quit pygame
+        pygame.quit()
+
+    def play(self):
+        """
+        Run the frame loop of one match until the players quit or click the restart button.
+        """
+        lag = 0.0
+        lock_wait = self.world.lock_stats()['wait_ms']
+        profiler = self.profiler
+        self.clock.tick()
+        start = profiler.begin()
+        while not self.handle_events():
+            profiler.lap('events', start)
+            ticks = self.ticks
+
+            # Simulate fixed ticks for the real time that passed since the last frame, until the match is over
+            lag += min(self.clock.tick(self.fps) / 1000, MAX_FRAME_TIME)
+            self.frame_times.append(self.clock.get_time())
+            while lag >= self.tick_length and not self.is_over():
+                self.update()
+                lag -= self.tick_length
+
+            # Draw the state between the last two ticks
+            self.render(lag / self.tick_length)
+
+            # Commit the phase times with how long this frame waited for board locks
+            previous_wait, lock_wait = lock_wait, self.world.lock_stats()['wait_ms']
+            profiler.end_frame(self.ticks - ticks, lock_wait - previous_wait)
+            start = profiler.now()
+
+    def simulate(self, max_ticks=None):
         """
+        Play a whole match as fast as possible, typically in headless mode.
+
+        The timer and the spawners are driven by the tick count, so a match is
+        deterministic for given controllers and seed.
 
-        # Display the start screen
-        self.start_screen()
+        Args:
+            max_ticks: stop after this many ticks even if the match is not over (optional)
 
-        # Prepare game
+        Returns:
+            dict: winner (1, 2, or 0 for a draw), both scores, ticks played, match duration
+                in game seconds and number of explosions
+        """
         self.prepare()
+        while not self.is_over() and (max_ticks is None or self.ticks < max_ticks):
+            self.update()
+
+        # Drop the game over events nobody is waiting for
+        pygame.event.clear()
+        self.save_recording()
+        return {
+            'winner': self.winner(),
+            'score1': self.score1.score,
+            'score2': self.score2.score,
+            'ticks': self.ticks,
+            'duration': self.ticks / self.tick_rate,
+            'explosions': self.world.explosions,
+        }
 
-        # Create threads for timer countdown, spawning items, and spawning cubes
-        threads = [
-            th.Thread(target=self.timer.count_down),
-            th.Thread(target=self.spawn_items),
-            th.Thread(target=self.spawn_cubes)
-        ]
+    def save_recording(self):
+        """
+        Write the recorded input to the replay file, if the match is being recorded.
+        """
+        if self.recorder is not None:
+            self.recorder.save(self.record_file)
 
-        # Run threads
-        for thread in threads:
-            thread.start()
+    def is_over(self):
+        """
+        Check if the match has ended.
 
-        while not self.handle_events():
-            # Perform collision checks
-            self.bomb_collision()
-            self.item_collision()
-
-            # Define the board elements to be drawn
-            self.board_elements = [
-                self.background,
-                self.hero1,
-                self.hero2,
-                self.timer,
-                *self.items,
-                *self.cubes,
-                *self.bombs,
-                self.score1,
-                self.score2,
-                self.prof1,
-                self.prof2,
-                self.profitems1,
-                self.profitems2,
-                self.hero1_name,
-                self.hero2_name,
-            ]
-
-            # Draw the board and board elements
-            self.board.draw(*self.board_elements)
-
-        # Wait for threads to finish
-        for thread in threads:
-            thread.join()
+        Returns:
+            bool: True if the time is up or a hero has no lives left
+        """
+        return self.timer.time_left == 0 or self.hero1.lives == 0 or self.hero2.lives == 0
 
-        # Quit pygame
-        pygame.quit()
+    def winner(self):
+        """
+        Get the winner of the match.
+
+        Returns:
+            int: 1 or 2 for the winning hero, 0 for a draw
+        """
+        if self.hero1.lives == 0 and self.hero2.lives == 0:
+            return 0
+        if self.hero1.lives == 0:
+            return 2
+        if self.hero2.lives == 0:
+            return 1
+        if self.score1.score != self.score2.score:
+            return 1 if self.score1.score > self.score2.score else 2
+        return 0
+
+    def update(self):
+        """
+        Advance the game simulation by one tick.
+        """
+        profiler = self.profiler
+        start = profiler.now()
+        self.hero1.save_position()
+        self.hero2.save_position()
+        actions = (self.controllers[0].act(self, self.hero1), self.controllers[1].act(self, self.hero2))
+        if self.recorder is not None:
+            self.recorder.record(actions)
+        self.handle_input(actions)
+        start = profiler.lap('input', start)
+
+        # Perform collision checks
+        self.bomb_collision()
+        start = profiler.lap('bomb_collision', start)
+        self.item_collision()
+        start = profiler.lap('item_collision', start)
+        self.ticks += 1
+
+        # Fire the countdown and spawn events due at this tick
+        self.scheduler.advance()
+        profiler.lap('scheduler', start)
+
+    def render(self, alpha):
+        """
+        Draw the current frame.
+
+        Args:
+            alpha: fraction of a tick elapsed since the last update, used to interpolate heroes
+        """
+        start = self.profiler.now()
+        self.hero1.interpolate(alpha)
+        self.hero2.interpolate(alpha)
+
+        # Keep the heroes in view on boards larger than the field
+        if self.board.camera is not None:
+            self.board.camera.follow((self.hero1.draw_rect, self.hero2.draw_rect))
+
+        # Pick the layers to be drawn
+        layers = self.profiler_layers if self.show_profiler else self.layers
+        start = self.profiler.lap('elements', start)
+
+        # Draw the board and its layers
+        self.board.draw(*layers)
+        self.profiler.lap('draw', start)
+
+    def frame_stats(self):
+        """
+        Summarize the pacing of recent frames.
+
+        Returns:
+            dict: measured fps, average and worst frame time and lock wait time per frame
+                in milliseconds, total lock waits, simulated ticks, and the entity pool counters
+        """
+        frame_times = list(self.frame_times) or [0]
+        lock_wait_times = list(self.profiler.history['lock_wait']) or [0]
+        return {
+            'fps': self.clock.get_fps(),
+            'frame_ms_avg': sum(frame_times) / len(frame_times),
+            'frame_ms_max': max(frame_times),
+            'lock_wait_ms_avg': sum(lock_wait_times) / len(lock_wait_times),
+            'lock_wait_ms_max': max(lock_wait_times),
+            'lock_waits': self.world.lock_stats()['waits'],
+            'ticks': self.ticks,
+            'pools': self.world.pool_stats(),
+        }
 
     def handle_events(self):
         """
         Handle game events such as quitting, time's up, player death, and button clicks.
 
         Returns:
-            True if the game should quit, False otherwise.
+            True if the match loop should stop, to quit or to restart when self.restart is set, False otherwise.
         """
         for event in pygame.event.get():
             if event.type == pygame.locals.QUIT:
-                # Quit the game
-                pygame.quit()
+                # Quit the game, run saves the trace and the recording and quits pygame
                 return True
-            elif event.type == pygame.USEREVENT and (
-                    self.timer.time_left == 0 or self.hero1.lives == 0 or self.hero2.lives == 0):
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Toggle the profiler overlay
+                self.show_profiler = not self.show_profiler
+            elif event.type == pygame.USEREVENT and self.is_over():
                 # Game over condition reached
-                self.board_elements.clear()
-                self.board_elements.append(self.background2)
+                self.save_recording()
+                elements = [self.background2]
                 if self.timer.time_left == 0:
-                    self.board_elements.append(self.text_end)
+                    elements.append(self.text_end)
                 elif self.hero1.lives == 0 or self.hero2.lives == 0:
-                    self.board_elements.append(self.text_end_live)
+                    elements.append(self.text_end_live)
                 self.text_points1.text = f"{self.hero1.name} points: {self.score1.score}"
                 self.text_points2.text = f"{self.hero2.name} points: {self.score2.score}"
-                self.board_elements.extend(
-                    [self.text_points1, self.text_points2, self.restart_button])
-                self.board.draw(*self.board_elements)
+                elements.extend([self.text_points1, self.text_points2, self.restart_button])
+                self.board.invalidate()
+                self.board.draw(elements)
 
                 while True:
                     # Wait for reset button click
                     for event in pygame.event.get():
                         if event.type == pygame.locals.QUIT:
-                            # Quit the game
-                            pygame.quit()
-                            exit()
+                            # Quit the game without restarting, run saves the trace and quits pygame
+                            return True
                         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left mouse button clicked
                             if self.restart_button.rect.collidepoint(
                                     pygame.mouse.get_pos()):  # Check if click occurred on the button
-                                self.reset_game()
-                                break
-                    else:
-                        continue  # If button not clicked, continue loop
-                    break  # If reset button clicked, exit the loop
-
-        # Key mappings for movement and actions
-        key_mappings = {
-            pygame.K_w: (0, -1, 0, 2),
-            pygame.K_s: (0, 1, 0, 2),
-            pygame.K_a: (-1, 0, 0, 2),
-            pygame.K_d: (1, 0, 0, 2),
-            pygame.K_UP: (0, -1, 0, 1),
-            pygame.K_DOWN: (0, 1, 0, 1),
-            pygame.K_LEFT: (-1, 0, 0, 1),
-            pygame.K_RIGHT: (1, 0, 0, 1),
-            pygame.K_RETURN: (0, 0, 1, 1),
-            pygame.K_KP_ENTER: (0, 0, 1, 1),
-            pygame.K_SPACE: (0, 0, 1, 2)
-        }
+                                self.restart = True
+                                return True
+                    self.clock.tick(self.fps)
 
-        keys = pygame.key.get_pressed()
+        return False
 
-        for key, movement in key_mappings.items():
-            if keys[key]:
-                x, y, action, hero = movement
-                x = x * 1.49
-                y = y * 1.49
-                hero_obj = self.hero2 if hero == 2 else self.hero1
-                if action == 0:
+    def handle_input(self, actions):
+        """
+        Move heroes and drop bombs according to their input for this tick.
+
+        Args:
+            actions: pair of input bit combinations for hero 1 and hero 2
+        """
+        for player, hero_obj, other, action in ((1, self.hero1, self.hero2, actions[0]),
+                                                (2, self.hero2, self.hero1, actions[1])):
+            for move, (x, y) in MOVES.items():
+                if action & move:
+                    x = x * HERO_SPEED
+                    y = y * HERO_SPEED
                     # Move the hero and check for collisions
-                    hero_obj.move(x, y, self.board)
-                    if check_collision(hero=hero_obj, cubes=self.cubes):
-                        hero_obj.move(-x, -y, self.board)
-                elif action == 1 and hero_obj.bomb == 1:
-                    # Spawn bombs
-                    hero_obj.bomb = 0
-                    self.spawn_bombs(hero_obj.rect.x, hero_obj.rect.y, hero)
+                    hero_obj.move(x, y, self.board, other)
+                    if check_collision(hero=hero_obj, cube_index=self.world.cube_index):
+                        hero_obj.move(-x, -y, self.board, other)
+            if action & DROP_BOMB and hero_obj.bomb == 1:
+                # Spawn bombs
+                hero_obj.bomb = 0
+                self.spawn_bombs(hero_obj.rect.x, hero_obj.rect.y, player, hero_obj.blast_radius)
 
 
 if __name__ == "__main__":
-    game = Game(1200, 600, 110)
+    parser = argparse.ArgumentParser(description='Kaboom Combat')
+    parser.add_argument('--trace', help='write per-frame phase timings to this CSV or JSON file on exit')
+    parser.add_argument('--record', help='record the match to this replay file, play it back with replay.py')
+    parser.add_argument('--rows', type=int, default=16, help=f'number of rows of the board, up to {MAX_BOARD_SIZE}')
+    parser.add_argument('--columns', type=int, default=20,
+                        help=f'number of columns of the board, up to {MAX_BOARD_SIZE}')
+    parser.add_argument('--view-rows', type=int, help='number of rows shown at once, the view scrolls over the others')
+    parser.add_argument('--view-columns', type=int,
+                        help='number of columns shown at once, the view scrolls over the others')
+    args = parser.parse_args()
+    game = Game(1200, 600, 110, trace_file=args.trace, record_file=args.record, fast_start=True, rows=args.rows,
+                columns=args.columns, view_rows=args.view_rows, view_columns=args.view_columns)
     game.run()
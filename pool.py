@@ -0,0 +1,92 @@
+import threading as th
+
+
+class EntityPool:
+    def __init__(self, factory, max_free=512):
+        """
+        Initialize a free list recycling entities of one class.
+
+        Entities removed from the board are released to the pool and handed out
+        again by acquire, which re-runs their __init__ in place instead of
+        allocating a new object. The grid entities are slotted and only
+        reference shared cached images, so a recycled entity is as good as a
+        new one.
+
+        Args:
+            factory: class of the entities, called with the arguments of acquire when the pool is empty
+            max_free: maximum number of released entities kept for reuse, the others are dropped (default: 512)
+        """
+        self.factory = factory
+        self.max_free = max_free
+        self.free = []
+        self.lock = th.Lock()
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+        self.in_use = 0
+        self.peak = 0
+
+    def acquire(self, *args, **kwargs):
+        """
+        Get an entity, recycled if one was released, initialized with the given arguments.
+
+        Args:
+            *args: positional arguments of the entity's constructor
+            **kwargs: keyword arguments of the entity's constructor
+
+        Returns:
+            object: the initialized entity
+        """
+        with self.lock:
+            entity = self.free.pop() if self.free else None
+            if entity is None:
+                self.created += 1
+            else:
+                self.reused += 1
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+
+        if entity is None:
+            return self.factory(*args, **kwargs)
+        entity.__init__(*args, **kwargs)
+        return entity
+
+    def release(self, entity):
+        """
+        Give back an entity that was removed from every layer and index.
+
+        Args:
+            entity: entity returned by acquire, it must not be used after being released
+        """
+        with self.lock:
+            self.in_use -= 1
+            if len(self.free) < self.max_free:
+                self.free.append(entity)
+            else:
+                self.dropped += 1
+
+    def release_all(self, entities):
+        """
+        Give back several entities at once.
+
+        Args:
+            entities: entities returned by acquire
+        """
+        for entity in entities:
+            self.release(entity)
+
+    def stats(self):
+        """
+        Get the pool counters.
+
+        Returns:
+            dict: entities created, reused and dropped, in use now and at most, and waiting in the free list
+        """
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'dropped': self.dropped,
+            'in_use': self.in_use,
+            'peak': self.peak,
+            'free': len(self.free),
+        }
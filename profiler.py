@@ -0,0 +1,144 @@
+import collections
+import csv
+import json
+import time
+
+# Phases of a frame, in the order they run
+PHASES = ('events', 'input', 'bomb_collision', 'item_collision', 'scheduler', 'elements', 'draw')
+
+
+def percentile(values, fraction):
+    """
+    Get the nearest-rank percentile of a list of values.
+
+    Args:
+        values: sorted list of values
+        fraction: percentile between 0 and 1
+
+    Returns:
+        float: the percentile, 0 for an empty list
+    """
+    if not values:
+        return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+class FrameProfiler:
+    def __init__(self, window=600, max_trace=100000):
+        """
+        Initialize a profiler timing each phase of every frame.
+
+        Phase times are accumulated with lap during a frame and committed by
+        end_frame, which keeps the last window frames for percentiles and
+        appends a row to the trace that dump writes to disk. The time the frame
+        waited for board locks is kept alongside, it overlaps the phases.
+
+        Args:
+            window: number of recent frames used for percentiles (default: 600)
+            max_trace: maximum number of frames kept for dump, the oldest are dropped, 0 keeps none (default: 100000)
+        """
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.history = {phase: collections.deque(maxlen=window) for phase in ('frame', 'work', 'lock_wait', *PHASES)}
+        self.trace = collections.deque(maxlen=max_trace)
+        self.frames = 0
+        self.started = time.perf_counter()
+        self.frame_start = self.started
+
+    def begin(self):
+        """
+        Start timing the first frame.
+
+        Returns:
+            float: the current time, the start of the first phase
+        """
+        self.frame_start = time.perf_counter()
+        return self.frame_start
+
+    def now(self):
+        """
+        Get the current time for timing a phase.
+
+        Returns:
+            float: time in seconds
+        """
+        return time.perf_counter()
+
+    def lap(self, phase, start):
+        """
+        Add the time since start to a phase of the current frame.
+
+        Args:
+            phase: one of PHASES
+            start: value returned by now or by the previous lap
+
+        Returns:
+            float: the current time, the start of the next phase
+        """
+        end = time.perf_counter()
+        self.current[phase] += end - start
+        return end
+
+    def end_frame(self, ticks=0, lock_wait=0.0):
+        """
+        Commit the phase times of the current frame and start the next one.
+
+        Args:
+            ticks: number of simulation ticks run in the frame (default: 0)
+            lock_wait: milliseconds the frame waited for board locks (default: 0)
+        """
+        end = time.perf_counter()
+        row = {phase: seconds * 1000 for phase, seconds in self.current.items()}
+        row['work'] = sum(row.values())
+        row['frame'] = (end - self.frame_start) * 1000
+        row['lock_wait'] = lock_wait
+        for phase, milliseconds in row.items():
+            self.history[phase].append(milliseconds)
+        if self.trace.maxlen:
+            row['ticks'] = ticks
+            row['time_ms'] = (end - self.started) * 1000
+            row['index'] = self.frames
+            self.trace.append(row)
+
+        self.frames += 1
+        self.frame_start = end
+        for phase in self.current:
+            self.current[phase] = 0.0
+
+    def percentiles(self, phase):
+        """
+        Get the rolling percentiles of a phase.
+
+        Args:
+            phase: one of PHASES, 'work' (all phases), 'frame' (wall time including the frame limiter)
+                or 'lock_wait' (time waiting for board locks)
+
+        Returns:
+            dict: p50, p95 and p99 in milliseconds over the recent frames
+        """
+        values = sorted(self.history[phase])
+        return {'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95), 'p99': percentile(values, 0.99)}
+
+    def summary(self):
+        """
+        Get the rolling percentiles of every phase.
+
+        Returns:
+            dict: percentiles keyed by phase, work, frame and lock wait last
+        """
+        return {phase: self.percentiles(phase) for phase in (*PHASES, 'work', 'frame', 'lock_wait')}
+
+    def dump(self, path):
+        """
+        Write the per-frame trace to a file.
+
+        Args:
+            path: output file, JSON if it ends with .json, CSV otherwise
+        """
+        columns = ['index', 'time_ms', 'ticks', *PHASES, 'work', 'frame', 'lock_wait']
+        with open(path, 'w', newline='') as file:
+            if path.endswith('.json'):
+                json.dump({'frames': list(self.trace), 'summary': self.summary()}, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, columns)
+                writer.writeheader()
+                writer.writerows(self.trace)
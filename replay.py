@@ -0,0 +1,197 @@
+"""
+Record the input of a match and play it back.
+
+A replay file holds a header with everything that decides the match (board
+and view size, tick rate, game time and the world seed) followed by the input of both
+heroes, one byte per hero per tick. Replaying feeds the bytes back through the
+same Game.update loop, so a replay reproduces the match exactly.
+
+Usage: python replay.py match.kbr [--window] [--repeat 10]
+"""
+import argparse
+import os
+import struct
+import time
+
+# Keep the greeting pygame prints when imported out of the results on stdout
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+MAGIC = b'KBRP'
+VERSION = 2
+
+# magic, version, tick rate, game time, window width, window height, rows, columns, view rows, view columns, seed
+HEADER = struct.Struct('<4sBHHHHHHHHQ')
+
+# Fields of the header after the magic and the version
+FIELDS = ('tick_rate', 'game_time', 'width', 'height', 'rows', 'columns', 'view_rows', 'view_columns', 'seed')
+
+
+class Recorder:
+    def __init__(self, game):
+        """
+        Initialize a recorder for the match played by a game.
+
+        Args:
+            game: the game whose input is recorded, its world seed is stored in the header
+        """
+        self.header = {
+            'tick_rate': game.tick_rate,
+            'game_time': game.game_time,
+            'width': game.width,
+            'height': game.height,
+            'rows': game.world.rows,
+            'columns': game.world.columns,
+            'view_rows': game.board.geometry.view_rows,
+            'view_columns': game.board.geometry.view_columns,
+            'seed': game.world.seed,
+        }
+        self.inputs = bytearray()
+
+    def record(self, actions):
+        """
+        Append the input of one tick.
+
+        Args:
+            actions: pair of input bit combinations for hero 1 and hero 2
+        """
+        self.inputs.extend(actions)
+
+    def save(self, path):
+        """
+        Write the header and the recorded input to a file.
+
+        Args:
+            path: path of the replay file
+        """
+        header = self.header
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, *(header[field] for field in FIELDS)))
+            file.write(self.inputs)
+
+
+class ReplayController:
+    def __init__(self, inputs, player):
+        """
+        Initialize a controller playing back one hero's recorded input.
+
+        Args:
+            inputs: recorded input, two bytes per tick
+            player: 0 for hero 1, 1 for hero 2
+        """
+        self.inputs = inputs
+        self.player = player
+
+    def act(self, game, hero):
+        """
+        Get the hero's input for the current tick.
+
+        Args:
+            game: the game being played
+            hero: the controlled hero
+
+        Returns:
+            int: combination of MOVE_* and DROP_BOMB bits, 0 after the end of the recording
+        """
+        index = game.ticks * 2 + self.player
+        if index < len(self.inputs):
+            return self.inputs[index]
+        return 0
+
+
+class Replay:
+    def __init__(self, header, inputs):
+        """
+        Initialize a recorded match.
+
+        Args:
+            header: dictionary with tick_rate, game_time, width, height, rows, columns, view_rows, view_columns
+                and seed
+            inputs: recorded input, two bytes per tick
+        """
+        self.header = header
+        self.inputs = bytes(inputs)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a replay file.
+
+        Args:
+            path: path of the replay file
+
+        Returns:
+            Replay: the recorded match
+
+        Raises:
+            ValueError: if the file is not a replay or was written by another version
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a replay")
+        magic, version, *fields = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        if version != VERSION:
+            raise ValueError(f"{path} has replay version {version}, expected {VERSION}")
+        header = dict(zip(FIELDS, fields))
+        return cls(header, data[HEADER.size:])
+
+    @property
+    def ticks(self):
+        """
+        Number of recorded ticks.
+        """
+        return len(self.inputs) // 2
+
+    def controllers(self):
+        """
+        Create the controllers playing back both heroes.
+
+        Returns:
+            tuple: controllers of hero 1 and hero 2
+        """
+        return ReplayController(self.inputs, 0), ReplayController(self.inputs, 1)
+
+    def create_game(self, headless=True):
+        """
+        Create a game set up exactly like the recorded one.
+
+        Args:
+            headless: run without a window (default: True)
+
+        Returns:
+            Game: the game, driven by the recorded input, on a board and with a view of the recorded size
+        """
+        from main import Game
+        header = self.header
+        return Game(header['width'], header['height'], header['game_time'], tick_rate=header['tick_rate'],
+                    headless=headless, controllers=self.controllers(), seed=header['seed'], rows=header['rows'],
+                    columns=header['columns'], view_rows=header['view_rows'], view_columns=header['view_columns'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play back a recorded Kaboom Combat match.')
+    parser.add_argument('replay', help='replay file written by main.py --record')
+    parser.add_argument('--window', action='store_true', help='show the match in real time instead of headless')
+    parser.add_argument('--repeat', type=int, default=1, help='number of headless playbacks to time')
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    if args.window:
+        replay.create_game(headless=False).run(show_start_screen=False)
+        return
+
+    timings = []
+    for _ in range(args.repeat):
+        game = replay.create_game()
+        start = time.perf_counter()
+        result = game.simulate(max_ticks=replay.ticks)
+        timings.append(time.perf_counter() - start)
+    result['seconds_min'] = min(timings)
+    result['ticks_per_second'] = result['ticks'] / min(timings)
+    print(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import heapq
+import itertools
+
+
+class ScheduledEvent:
+    def __init__(self, time, callback, args, interval=None):
+        """
+        Initialize an event waiting in a scheduler.
+
+        Args:
+            time: tick at which the event fires
+            callback: function called when the event fires
+            args: positional arguments passed to the callback
+            interval: number of ticks between repetitions, or None for a one-shot event
+        """
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+
+class Scheduler:
+    def __init__(self):
+        """
+        Initialize a scheduler firing callbacks at simulation ticks.
+
+        Events wait in a priority queue ordered by tick, and events due at the
+        same tick fire in the order they were scheduled. The scheduler has no
+        thread of its own, the game loop calls advance once per tick.
+        """
+        self.now = 0
+        self.queue = []
+        self.order = itertools.count()
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call a function once after a number of ticks.
+
+        Args:
+            delay: number of ticks from now
+            callback: function to call
+            *args: positional arguments passed to the callback
+
+        Returns:
+            ScheduledEvent: handle that can be passed to cancel
+        """
+        return self.push(ScheduledEvent(self.now + delay, callback, args))
+
+    def schedule_every(self, interval, callback, *args):
+        """
+        Call a function every interval ticks, starting interval ticks from now.
+
+        Args:
+            interval: number of ticks between calls
+            callback: function to call
+            *args: positional arguments passed to the callback
+
+        Returns:
+            ScheduledEvent: handle that can be passed to cancel
+        """
+        return self.push(ScheduledEvent(self.now + interval, callback, args, interval))
+
+    def push(self, event):
+        """
+        Add an event to the queue.
+
+        Args:
+            event: the event to add
+
+        Returns:
+            ScheduledEvent: the added event
+        """
+        heapq.heappush(self.queue, (event.time, next(self.order), event))
+        return event
+
+    def cancel(self, event):
+        """
+        Stop an event from firing. Cancelled events are dropped when they reach the front of the queue.
+
+        Args:
+            event: handle returned by schedule or schedule_every
+        """
+        event.cancelled = True
+
+    def clear(self):
+        """
+        Cancel every pending event.
+        """
+        for _, _, event in self.queue:
+            event.cancelled = True
+        self.queue.clear()
+
+    def reset(self):
+        """
+        Cancel every pending event and count ticks from 0 again, for a new match.
+        """
+        self.clear()
+        self.now = 0
+        self.order = itertools.count()
+
+    def advance(self, ticks=1):
+        """
+        Move time forward and fire the events that became due, in order.
+
+        Args:
+            ticks: number of ticks to advance (default: 1)
+        """
+        self.now += ticks
+        while self.queue and self.queue[0][0] <= self.now:
+            _, _, event = heapq.heappop(self.queue)
+            if event.cancelled:
+                continue
+            if event.interval is not None:
+                event.time += event.interval
+                self.push(event)
+            event.callback(*event.args)
+
+    def __len__(self):
+        """
+        Count the pending events.
+
+        Returns:
+            int: number of events that have not fired or been cancelled
+        """
+        return sum(not event.cancelled for _, _, event in self.queue)
@@ -0,0 +1,153 @@
+"""
+Play many headless matches in parallel and summarize the results.
+
+Usage: python simulation.py --matches 1000 --workers 8 --seed 1 --hero1 random --hero2 patrol
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Simulated matches never open a window, and stdout only carries the results
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from main import Game
+from controls import (MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, DROP_BOMB,
+                      RandomController, ScriptedController)
+
+# Scripts of (action, ticks) pairs for the scripted policies
+SCRIPTS = {
+    'idle': [(0, 1)],
+    'patrol': [(MOVE_LEFT, 120), (MOVE_DOWN | DROP_BOMB, 1), (MOVE_DOWN, 59),
+               (MOVE_RIGHT, 120), (MOVE_UP | DROP_BOMB, 1), (MOVE_UP, 59)],
+}
+
+POLICIES = ['random', *SCRIPTS]
+
+
+def make_controller(policy, seed):
+    """
+    Create the controller playing a hero.
+
+    Args:
+        policy: 'random' or the name of a script in SCRIPTS
+        seed: seed of the controller's random number generator
+
+    Returns:
+        controller with an act(game, hero) method
+    """
+    if policy == 'random':
+        return RandomController(seed)
+    return ScriptedController(SCRIPTS[policy])
+
+
+def play_match(seed, policies=('random', 'random'), game_time=110, tick_rate=100, rows=16, columns=20):
+    """
+    Play one headless match.
+
+    Args:
+        seed: seed of the match, used for the board and both controllers
+        policies: policies of hero 1 and hero 2 (default: both random)
+        game_time: match length in game seconds (default: 110)
+        tick_rate: simulation ticks per game second (default: 100)
+        rows: number of rows of the board (default: 16)
+        columns: number of columns of the board (default: 20)
+
+    Returns:
+        dict: result of Game.simulate with the seed added
+    """
+    controllers = (make_controller(policies[0], seed * 2 + 1), make_controller(policies[1], seed * 2 + 2))
+    game = Game(1200, 600, game_time, tick_rate=tick_rate, headless=True, controllers=controllers, seed=seed,
+                rows=rows, columns=columns)
+    result = game.simulate()
+    result['seed'] = seed
+    return result
+
+
+def run_batch(matches, workers=None, seed=0, policies=('random', 'random'), game_time=110, tick_rate=100, rows=16,
+              columns=20):
+    """
+    Play independent matches across a process pool.
+
+    Every match gets its own seed (seed, seed + 1, ...), so a batch is
+    reproducible regardless of the number of workers.
+
+    Args:
+        matches: number of matches to play
+        workers: number of worker processes (default: number of CPUs)
+        seed: seed of the first match (default: 0)
+        policies: policies of hero 1 and hero 2 (default: both random)
+        game_time: match length in game seconds (default: 110)
+        tick_rate: simulation ticks per game second (default: 100)
+        rows: number of rows of the board (default: 16)
+        columns: number of columns of the board (default: 20)
+
+    Returns:
+        list: match results ordered by seed
+    """
+    workers = workers or os.cpu_count()
+    chunksize = max(1, matches // (workers * 4))
+    seeds = range(seed, seed + matches)
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(play_match, seeds, repeat(policies), repeat(game_time), repeat(tick_rate),
+                                 repeat(rows), repeat(columns), chunksize=chunksize))
+
+
+def summarize(results):
+    """
+    Aggregate match results.
+
+    Args:
+        results: list of match results
+
+    Returns:
+        dict: number of matches, wins per hero, draws and average scores, duration and explosions
+    """
+    count = len(results) or 1
+    return {
+        'matches': len(results),
+        'wins1': sum(result['winner'] == 1 for result in results),
+        'wins2': sum(result['winner'] == 2 for result in results),
+        'draws': sum(result['winner'] == 0 for result in results),
+        'score1_avg': sum(result['score1'] for result in results) / count,
+        'score2_avg': sum(result['score2'] for result in results) / count,
+        'duration_avg': sum(result['duration'] for result in results) / count,
+        'explosions_avg': sum(result['explosions'] for result in results) / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Kaboom Combat matches without a window.')
+    parser.add_argument('--matches', type=int, default=100, help='number of matches to play')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first match')
+    parser.add_argument('--hero1', choices=POLICIES, default='random', help='policy of hero 1')
+    parser.add_argument('--hero2', choices=POLICIES, default='random', help='policy of hero 2')
+    parser.add_argument('--game-time', type=int, default=110, help='match length in game seconds')
+    parser.add_argument('--tick-rate', type=int, default=100, help='simulation ticks per game second')
+    parser.add_argument('--rows', type=int, default=16, help='number of rows of the board')
+    parser.add_argument('--columns', type=int, default=20, help='number of columns of the board')
+    parser.add_argument('--output', help='write every match result to this JSON file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_batch(args.matches, args.workers, args.seed, (args.hero1, args.hero2),
+                        args.game_time, args.tick_rate, args.rows, args.columns)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary['wall_seconds'] = elapsed
+    summary['matches_per_minute'] = len(results) / elapsed * 60
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,9 @@
-import math
-import main
-import drawable as dr
-import random
-import pygame
+import numpy as np
+from grid import BOMB, CUBE, ITEM
 
 
 class Spawn:
-    def spawn_bombs(self, x, y, player):
+    def spawn_bombs(self, x, y, player, radius=1):
         """
         Spawn bombs at the specified position on the game board.
 
@@ -14,105 +11,104 @@ class Spawn:
             x (int): The x-coordinate of the position.
             y (int): The y-coordinate of the position.
             player (int): The player number.
+            radius (int, optional): The number of cells the blast reaches in each direction. Defaults to 1.
         """
 
-        # Map the position to the corresponding indices in cord_list
-        j = math.floor(
-            (x - self.board.surface.get_width() * 0.25) / (
-                    (self.board.surface.get_width() * 0.7) / len(main.cord_list[0])))
-        i = math.floor((y - self.board.surface.get_height() * 0.04) / (
-                (self.board.surface.get_height() * 0.9265) / len(main.cord_list)))
+        # Map the position to the corresponding cell of the board, heroes can stand a pixel or two past
+        # its right and bottom edges, which on boards with tiny cells is past the last cell
+        world = self.world
+        geometry = self.board.geometry
+        i, j = geometry.cell_at(x, y)
+        i = min(max(i, 0), world.rows - 1)
+        j = min(max(j, 0), world.columns - 1)
 
-        main.lock.acquire()
-        main.cord_list[i][j] = 1
-         # Calculate the width and height of the bomb based on the board size
-        width = math.floor((self.board.surface.get_width() * 0.7) / 20)
-        height = math.floor(
-            (self.board.surface.get_height() * 0.9265) / 16)
+        world.grid.set(i, j, BOMB)
 
-        # Create a new bomb and add it to the list
-        bomb = dr.Bomb(self.board, image_file='images/bomb.png',
-                       width=width, height=height, player=player, i=i, j=j)
-        self.bombs.append(bomb)
+        # Get a bomb sized to a cell from the pool outside the lock, then add it to the list
+        bomb = world.bomb_pool.acquire(self.board, image_file='images/bomb.png', width=geometry.cell_width,
+                                       height=geometry.cell_height, player=player, i=i, j=j, radius=radius)
+        world.lock.acquire()
+        world.bombs.add(bomb)
+        world.lock.release()
 
-
-        main.lock.release()
-
-    def spawn_cubes(self, iteration=1000000000000, wait=True):
+    def spawn_cubes(self, iteration=1):
         """
         Spawn cubes on the game board.
 
+        Each iteration places one cube on a random empty cell that is neither a
+        corner spawn point nor next to a hero. The cell is drawn from the board's
+        free list in constant time, and a full board is detected immediately.
+        The cell is claimed atomically and the cube is created outside the lock,
+        an iteration whose cell was taken by another thread places nothing.
+        Nothing here depends on the number of cells, except the fallback scan
+        of a nearly full board.
+
         Args:
-            iteration (int, optional): The number of iterations to spawn cubes. Defaults to 1000000000000.
-            wait (bool, optional): Whether to wait between spawning cubes. Defaults to True.
+            iteration (int, optional): The number of cubes to spawn. Defaults to 1.
         """
-        rows = len(main.cord_list)
-        columns = len(main.cord_list[0])
+        world = self.world
+        reserved = self.reserved
 
         for _ in range(iteration):
-            i = random.randrange(rows)
-            j = random.randrange(columns)
-
-            main.lock.acquire()
-
-            # Check if the selected position is available
-            if main.cord_list[i][j] == 0 and not self.is_corner_or_adjacent(i, j, columns):
-                # Check collision with heroes
-                hero_collision = False
-                for hero in [self.hero1, self.hero2]:
-                    hero_i = hero.get_position_i()
-                    hero_j = hero.get_position_j()
-                    if abs(hero_i - i) <= 1 and abs(hero_j - j) <= 1:
-                        hero_collision = True
-                        break
-
-                if not hero_collision:
-                    main.cord_list[i][j] = 1
-
-                    # Calculate the position, width, and height of the cube based on the board size
-                    x = math.ceil(
-                        (self.board.surface.get_width() * 0.25) + math.ceil(
-                            (self.board.surface.get_width() * 0.7 / columns) * j))
-                    y = math.ceil((self.board.surface.get_height() * 0.04) + math.ceil(
-                        (self.board.surface.get_height() * 0.9265 / rows) * i))
-                    width = math.floor((self.board.surface.get_width() * 0.7) / 20)
-                    height = math.floor(
-                        (self.board.surface.get_height() * 0.9265) / 16)
-
-                    # Create a new cube and add it to the list
-                    cube = dr.Cube(x, y, width, height, i=i, j=j)
-                    self.cubes.append(cube)
-
-            main.lock.release()
-            pygame.time.wait(5000) if wait else None
-
-    def spawn_items(self):
+            heroes = [(hero.get_position_i(), hero.get_position_j()) for hero in [self.hero1, self.hero2]]
+
+            def is_allowed(i, j):
+                return not reserved[i, j] and all(abs(hero_i - i) > 1 or abs(hero_j - j) > 1
+                                                  for hero_i, hero_j in heroes)
+
+            # Pick one of the available positions
+            cell = world.grid.random_free_cell(accept=is_allowed, rng=world.rng)
+            if cell is None and world.grid.free_count():
+                # Most free cells are near the heroes or corners, filter all of them at once
+                cells = world.grid.free_cells_away_from(heroes, distance=1, exclude=reserved)
+                if len(cells):
+                    cell = tuple(int(index) for index in cells[world.rng.randrange(len(cells))])
+
+            if cell is not None and world.grid.claim(*cell, CUBE):
+                i, j = cell
+
+                # Get a cube filling the cell from the pool outside the lock, then add it to the list
+                geometry = self.board.geometry
+                x, y = geometry.origin(i, j)
+                cube = world.cube_pool.acquire(x, y, geometry.cell_width, geometry.cell_height, i=i, j=j, rng=world.rng)
+                world.lock.acquire()
+                world.cubes.add(cube)
+                world.lock.release()
+
+    def spawn_item(self):
         """
-        Spawn items at random positions on the game board.
+        Spawn one item at a random empty position, unless the board is full.
         """
+        world = self.world
+
+        # Pick one of the available positions, None when the board is full
+        cell = world.grid.random_free_cell(rng=world.rng)
+        if cell is not None and world.grid.claim(*cell, ITEM):
+            i, j = cell
+
+            # Get an item sized to a cell from the pool outside the lock, then add it to the list
+            item = world.item_pool.acquire(self.board, item_type=world.rng.randrange(2),
+                                           width=self.board.geometry.cell_width,
+                                           height=self.board.geometry.cell_height, i=i, j=j)
+            world.lock.acquire()
+            world.items.add(item)
+            world.lock.release()
+
+    def reserved_cells(self):
+        """
+        Get the cells cubes never spawn on, the heroes' starting corners and the cells next to them.
 
-        while True:
-            i = random.randrange(len(main.cord_list))
-            j = random.randrange(len(main.cord_list[0]))
-
-            main.lock.acquire()
-
-            # Check if the selected position is available
-            if main.cord_list[i][j] == 0:
-                main.cord_list[i][j] = 1
-
-                # Calculate the width and height of the item based on the board size
-                width = math.floor((self.board.surface.get_width() * 0.7) / 20)
-                height = math.floor(
-                    (self.board.surface.get_height() * 0.9265) / 16)
-
-                # Create a new item and add it to the list
-                item = dr.Item(self.board, item_type=random.randrange(
-                    2), width=width, height=height, i=i, j=j)
-                self.items.append(item)
+        The heroes start in the top corners of the first view, which are the
+        corners of the board unless it has more columns than the view.
 
-            main.lock.release()
-            pygame.time.wait(5000)
+        Returns:
+            numpy.ndarray: rows x columns boolean mask, True for reserved cells
+        """
+        rows = self.world.rows
+        columns = self.world.columns
+        view_columns = self.board.geometry.view_columns
+        return np.array([[self.is_corner_or_adjacent(i, j, view_columns) for j in range(columns)]
+                         for i in range(rows)])
 
     def is_corner_or_adjacent(self, i, j, columns):
         """
@@ -0,0 +1,57 @@
+from controls import RandomController
+from main import Game
+
+
+def scrolling_game():
+    game = Game(1200, 600, 110, controllers=(RandomController(1), RandomController(2)), seed=0, rows=48, columns=60,
+                view_rows=16, view_columns=20)
+    game.prepare()
+    return game
+
+
+def assert_heroes_in_field(game):
+    camera = game.board.camera
+    geometry = game.board.geometry
+    heroes = game.hero1.rect.union(game.hero2.rect)
+    assert heroes.width <= geometry.view_width and heroes.height <= geometry.view_height
+    for hero in (game.hero1, game.hero2):
+        assert camera.field.contains(camera.to_screen(hero.draw_rect))
+
+
+def test_heroes_stay_within_a_view_of_each_other_and_in_the_field():
+    game = scrolling_game()
+
+    # Hero 1 runs towards the far corner of the board faster than hero 2 follows it
+    for step in range(600):
+        game.hero1.save_position()
+        game.hero2.save_position()
+        game.hero1.move(3, 3, game.board, game.hero2)
+        game.hero2.move(1, 1, game.board, game.hero1)
+        game.render(1.0)
+        assert_heroes_in_field(game)
+    offset = game.board.camera.offset
+    assert offset[0] > 0 and offset[1] > 0
+
+    # Hero 2 walks back left, as far as hero 1 lets it
+    for step in range(600):
+        game.hero2.save_position()
+        game.hero2.move(-3, 0, game.board, game.hero1)
+        game.render(1.0)
+        assert_heroes_in_field(game)
+    assert game.hero2.rect.left > game.board.geometry.left
+
+
+def test_reset_scrolls_back_to_the_first_view():
+    game = scrolling_game()
+    for hero in (game.hero1, game.hero2):
+        hero.rect.move_ip(534, 723)
+        hero.save_position()
+    game.render(1.0)
+    assert game.board.camera.offset != (0, 0)
+
+    game.reset_game()
+    assert game.board.camera.offset == (0, 0)
+    game.prepare()
+    game.render(0)
+    assert game.board.camera.offset == (0, 0)
+    assert_heroes_in_field(game)
@@ -0,0 +1,31 @@
+from controls import RandomController
+from grid import CUBE
+from main import Game
+
+
+def test_blasts_free_their_cells_in_board_order():
+    game = Game(1200, 600, 110, headless=True, controllers=(RandomController(1), RandomController(2)), seed=0)
+    game.reset_game()
+    world = game.world
+    geometry = game.board.geometry
+
+    # A row of bombs setting each other off, with a cube above and below each one, placed from the last
+    # cell to the first so that the order of the entities in memory is not the order of their cells
+    for j in range(12, 4, -1):
+        for i in (9, 7):
+            assert world.grid.claim(i, j, CUBE)
+            x, y = geometry.origin(i, j)
+            world.cubes.add(world.cube_pool.acquire(x, y, geometry.cell_width, geometry.cell_height, i=i, j=j,
+                                                    rng=world.rng))
+        game.spawn_bombs(*geometry.origin(8, j), player=1)
+    for bomb in world.bombs:
+        bomb.timer = 0
+
+    free = len(world.grid.free)
+    game.bomb_collision()
+    assert not world.bombs and not world.cubes
+
+    # The freed cells are appended to the free list, which random spawns index into
+    freed = world.grid.free[free:]
+    assert len(freed) == 24
+    assert freed == sorted(freed)
@@ -0,0 +1,86 @@
+import random
+import sys
+import threading as th
+import numpy as np
+from grid import BoardGrid, CUBE, EMPTY
+
+
+def assert_free_list_matches(grid):
+    """
+    Check that the free list holds exactly the empty cells and that every position points back at its cell.
+
+    Args:
+        grid: BoardGrid to check
+    """
+    empty = set(np.flatnonzero(grid.cells == EMPTY).tolist())
+    assert len(grid.free) == len(empty)
+    assert set(grid.free) == empty
+    for cell in range(grid.cells.size):
+        position = grid.free_position[cell]
+        if cell in empty:
+            assert grid.free[position] == cell
+        else:
+            assert position == -1
+
+
+def test_claiming_and_clearing_keep_the_free_list_consistent():
+    grid = BoardGrid(3, 4)
+    rng = random.Random(0)
+    for _ in range(500):
+        i, j = rng.randrange(3), rng.randrange(4)
+        if rng.random() < 0.5:
+            was_empty = grid.get(i, j) == EMPTY
+            assert grid.claim(i, j, CUBE) == was_empty
+            assert grid.get(i, j) == CUBE
+        else:
+            grid.clear(i, j)
+        assert_free_list_matches(grid)
+    assert grid.free_count() == int((grid.cells == EMPTY).sum())
+
+
+def test_claim_only_takes_empty_cells():
+    grid = BoardGrid(2, 2)
+    assert grid.claim(1, 0, CUBE)
+    assert not grid.claim(1, 0, CUBE)
+    assert grid.free_count() == 3
+    # Removing the last entry of the free list and one in the middle
+    assert grid.claim(1, 1, CUBE)
+    assert grid.claim(0, 0, CUBE)
+    assert grid.free == [1]
+    assert_free_list_matches(grid)
+    assert grid.random_free_cell() == (0, 1)
+    assert grid.claim(0, 1, CUBE)
+    assert grid.random_free_cell() is None
+
+
+def test_threads_spawning_and_claiming_keep_the_free_list_consistent():
+    grid = BoardGrid(16, 20)
+    claimed = [[] for _ in range(8)]
+
+    def spawn(number):
+        rng = random.Random(number)
+        for _ in range(2000):
+            cell = grid.random_free_cell(rng=rng)
+            if cell is not None and grid.claim(*cell, CUBE):
+                claimed[number].append(cell)
+            # Free some cells again so the threads keep racing for the same ones
+            if claimed[number] and rng.random() < 0.4:
+                grid.clear(*claimed[number].pop(rng.randrange(len(claimed[number]))))
+
+    # Switch threads as often as possible so they interleave inside claim and the free list updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [th.Thread(target=spawn, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    # No cell was claimed by two threads, and the grid holds exactly the cells still claimed
+    cells = [cell for cells in claimed for cell in cells]
+    assert len(cells) == len(set(cells))
+    assert set(map(tuple, np.argwhere(grid.cells == CUBE).tolist())) == set(cells)
+    assert_free_list_matches(grid)
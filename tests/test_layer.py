@@ -0,0 +1,75 @@
+import pygame
+from grid import GridIndex
+from layer import Layer
+
+
+class Entity:
+    def __init__(self, i, j):
+        self.i = i
+        self.j = j
+        self.image = None
+        self.rect = pygame.Rect(j * 10, i * 10, 10, 10)
+
+def test_blits_follow_the_order_of_additions_and_are_cached_until_a_change():
+    layer = Layer()
+    entities = [Entity(0, j) for j in range(3)]
+    for entity in entities:
+        layer.add(entity)
+    sequence = layer.blits()
+    assert sequence == [(None, entity.rect) for entity in entities]
+    assert layer.blits() is sequence
+    regions = layer.regions()
+    assert layer.regions() is regions
+
+    layer.remove(entities[1])
+    assert layer.blits() == [(None, entities[0].rect), (None, entities[2].rect)]
+    assert layer.regions() != regions
+    assert entities[1] not in layer and len(layer) == 2
+    layer.discard(entities[1])
+    assert list(layer) == [entities[0], entities[2]]
+
+
+def test_changes_since_lists_additions_and_removals_in_order():
+    layer = Layer()
+    first = Entity(0, 0)
+    second = Entity(0, 1)
+    layer.add(first)
+    version = layer.version
+    layer.add(second)
+    layer.remove(first)
+    assert layer.changes_since(version) == [(True, None, (10, 0, 10, 10)), (False, None, (0, 0, 10, 10))]
+    assert layer.changes_since(layer.version) == []
+
+
+def test_changes_since_a_trimmed_version_is_none():
+    layer = Layer(max_log=8)
+    entities = [Entity(0, j) for j in range(9)]
+    for entity in entities:
+        layer.add(entity)
+
+    # The ninth change dropped the oldest half of the log
+    assert layer.log_start == 4
+    assert len(layer.log) == 5
+    assert layer.changes_since(3) is None
+    assert layer.changes_since(4) == [(True, None, tuple(entity.rect)) for entity in entities[4:]]
+    assert layer.changes_since(layer.version) == []
+
+    # Clearing logs nine removals at once, the log is trimmed again within them
+    layer.clear()
+    assert layer.version == 18
+    assert layer.log_start == 11
+    assert layer.changes_since(9) is None
+    assert layer.changes_since(11) == [(False, None, tuple(entity.rect)) for entity in entities[2:]]
+
+
+def test_index_follows_the_layer():
+    layer = Layer(GridIndex(2, 3))
+    entity = Entity(1, 2)
+    layer.add(entity)
+    assert layer.index.at(1, 2) == [entity]
+    assert list(layer.index.within(0, 0, 1, 1)) == []
+    layer.remove(entity)
+    assert layer.index.at(1, 2) == []
+    layer.add(entity)
+    layer.clear()
+    assert len(layer.index) == 0
@@ -0,0 +1,34 @@
+from pool import EntityPool
+
+
+class Entity:
+    __slots__ = ('i', 'j', 'marks')
+
+    def __init__(self, i=0, j=0):
+        self.i = i
+        self.j = j
+        self.marks = []
+
+
+def test_released_entity_is_reused_with_fresh_state():
+    pool = EntityPool(Entity)
+    entity = pool.acquire(1, 2)
+    entity.marks.append('blast')
+    pool.release(entity)
+
+    again = pool.acquire(3, j=4)
+    assert again is entity
+    assert (again.i, again.j, again.marks) == (3, 4, [])
+    assert pool.stats() == {'created': 1, 'reused': 1, 'dropped': 0, 'in_use': 1, 'peak': 1, 'free': 0}
+
+
+def test_entities_beyond_max_free_are_dropped():
+    pool = EntityPool(Entity, max_free=2)
+    entities = [pool.acquire() for _ in range(3)]
+    pool.release_all(entities)
+    assert pool.stats() == {'created': 3, 'reused': 0, 'dropped': 1, 'in_use': 0, 'peak': 3, 'free': 2}
+
+    # Only the kept entities come back, then new ones are created
+    again = [pool.acquire() for _ in range(3)]
+    assert sum(entity in entities for entity in again) == 2
+    assert pool.stats()['created'] == 4
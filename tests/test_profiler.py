@@ -0,0 +1,28 @@
+from profiler import FrameProfiler
+
+
+def test_frames_are_traced_only_when_asked_to():
+    traced = FrameProfiler(max_trace=2)
+    untraced = FrameProfiler(max_trace=0)
+    for frame in range(3):
+        for profiler in (traced, untraced):
+            profiler.lap('draw', profiler.now())
+            profiler.end_frame(ticks=frame)
+    assert [row['ticks'] for row in traced.trace] == [1, 2]
+    assert len(untraced.trace) == 0
+    assert untraced.frames == 3 and len(untraced.history['draw']) == 3
+
+
+def test_lock_wait_is_kept_beside_the_phases(tmp_path):
+    profiler = FrameProfiler()
+    profiler.lap('draw', profiler.now())
+    profiler.end_frame(ticks=1, lock_wait=2.5)
+    row = profiler.trace[0]
+    assert row['lock_wait'] == 2.5
+    assert row['work'] == row['draw']
+    assert profiler.summary()['lock_wait']['p50'] == 2.5
+
+    path = tmp_path / 'trace.csv'
+    profiler.dump(str(path))
+    header, values = path.read_text().splitlines()
+    assert header.split(',')[-1] == 'lock_wait' and values.split(',')[-1] == '2.5'
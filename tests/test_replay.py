@@ -0,0 +1,19 @@
+from controls import RandomController
+from main import Game
+from replay import Replay
+
+
+def test_replay_reproduces_the_recorded_match(tmp_path):
+    path = str(tmp_path / 'match.kbr')
+    game = Game(1200, 600, 20, headless=True, controllers=(RandomController(5), RandomController(6)), seed=3,
+                record_file=path, rows=12, columns=18)
+    recorded = game.simulate()
+
+    replay = Replay.load(path)
+    assert replay.header['seed'] == 3
+    assert (replay.header['rows'], replay.header['columns']) == (12, 18)
+    assert replay.ticks == recorded['ticks']
+
+    replayed = replay.create_game()
+    assert replayed.simulate(max_ticks=replay.ticks) == recorded
+    assert len(replayed.world.cubes) == len(game.world.cubes)
@@ -0,0 +1,41 @@
+from scheduler import Scheduler
+
+
+def test_events_fire_by_tick_then_in_scheduling_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule(3, fired.append, 'late')
+    scheduler.schedule(1, fired.append, 'first')
+    scheduler.schedule(1, fired.append, 'second')
+    scheduler.schedule_every(2, fired.append, 'every')
+
+    scheduler.advance()
+    assert fired == ['first', 'second']
+    scheduler.advance(3)
+    assert fired == ['first', 'second', 'every', 'late', 'every']
+    assert len(scheduler) == 1
+
+
+def test_cancelled_events_do_not_fire():
+    scheduler = Scheduler()
+    fired = []
+    once = scheduler.schedule(1, fired.append, 'once')
+    every = scheduler.schedule_every(1, fired.append, 'every')
+    scheduler.cancel(once)
+    scheduler.advance()
+    scheduler.cancel(every)
+    scheduler.advance(5)
+    assert fired == ['every']
+    assert len(scheduler) == 0
+
+
+def test_reset_drops_pending_events_and_restarts_time():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule_every(1, fired.append, 'old')
+    scheduler.advance(2)
+    scheduler.reset()
+    scheduler.schedule(1, fired.append, 'new')
+    scheduler.advance()
+    assert scheduler.now == 1
+    assert fired == ['old', 'old', 'new']
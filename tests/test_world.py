@@ -0,0 +1,22 @@
+from controls import RandomController
+from main import Game
+
+
+def test_pools_track_the_entities_on_the_board_and_reuse_them_after_a_reset():
+    game = Game(1200, 600, 110, headless=True, controllers=(RandomController(1), RandomController(2)), seed=0)
+    game.hero1.lives = game.hero2.lives = 10 ** 6
+    game.simulate(max_ticks=3000)
+    world = game.world
+    for layer, pool in ((world.cubes, world.cube_pool), (world.bombs, world.bomb_pool),
+                        (world.items, world.item_pool), (world.marks, world.mark_pool)):
+        assert pool.in_use == len(layer)
+    assert world.bomb_pool.reused > 0
+
+    cubes = set(world.cubes)
+    game.reset_game()
+    assert all(stats['in_use'] == 0 for stats in world.pool_stats().values())
+    assert len(world.cube_index) == 0
+
+    game.prepare()
+    assert world.cube_pool.reused > 0
+    assert cubes & set(world.cubes)
@@ -0,0 +1,126 @@
+import random
+import drawable as dr
+from grid import BoardGrid, GridIndex
+from layer import Layer
+from locks import CountingLock
+from pool import EntityPool
+
+
+class World:
+    def __init__(self, rows=16, columns=20, seed=None):
+        """
+        Initialize the state of one match.
+
+        Everything the simulation mutates lives here instead of in module
+        globals, so several matches can run in the same process.
+
+        Args:
+            rows: number of rows of the board (default: 16)
+            columns: number of columns of the board (default: 20)
+            seed: seed of the random number generator placing cubes and items,
+                a random one is picked and kept in self.seed when omitted (optional)
+        """
+        # Lock guarding the entity lists and indexes, the grid has its own per-row locks
+        self.lock = CountingLock()
+
+        # Cell type codes of the board, all cells empty
+        self.grid = BoardGrid(rows, columns)
+
+        # Entities on the board and the delete marks of bombs about to explode, in drawing order. Items,
+        # cubes and bombs are also indexed by cell so collisions, blasts and the camera only look at a few cells
+        self.items = Layer(GridIndex(rows, columns))
+        self.cubes = Layer(GridIndex(rows, columns))
+        self.bombs = Layer(GridIndex(rows, columns))
+        self.marks = Layer()
+
+        # Recycle the entities removed from the board instead of allocating new ones
+        self.cube_pool = EntityPool(dr.Cube)
+        self.bomb_pool = EntityPool(dr.Bomb)
+        self.item_pool = EntityPool(dr.Item)
+        self.mark_pool = EntityPool(dr.Delete)
+
+        # Keep the seed so the match can be recorded and replayed
+        self.reseed(seed)
+        self.explosions = 0
+
+    @property
+    def cube_index(self):
+        """
+        Cubes indexed by cell.
+        """
+        return self.cubes.index
+
+    @property
+    def bomb_index(self):
+        """
+        Bombs indexed by cell.
+        """
+        return self.bombs.index
+
+    @property
+    def rows(self):
+        """
+        Number of rows of the board.
+        """
+        return self.grid.rows
+
+    @property
+    def columns(self):
+        """
+        Number of columns of the board.
+        """
+        return self.grid.columns
+
+    def reset(self):
+        """
+        Remove every entity and mark every cell as empty.
+        """
+        self.grid.reset()
+        self.lock.acquire()
+        self.item_pool.release_all(self.items)
+        self.bomb_pool.release_all(self.bombs)
+        self.cube_pool.release_all(self.cubes)
+        self.mark_pool.release_all(self.marks)
+        self.items.clear()
+        self.bombs.clear()
+        self.cubes.clear()
+        self.marks.clear()
+        self.explosions = 0
+        self.lock.release()
+
+    def reseed(self, seed=None):
+        """
+        Restart the random number generator placing cubes and items.
+
+        Args:
+            seed: the new seed, a random one is picked and kept in self.seed when omitted (optional)
+        """
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+    def pool_stats(self):
+        """
+        Get the counters of the entity pools.
+
+        Returns:
+            dict: counters of the cube, bomb, item and mark pools, see EntityPool.stats
+        """
+        return {
+            'cubes': self.cube_pool.stats(),
+            'bombs': self.bomb_pool.stats(),
+            'items': self.item_pool.stats(),
+            'marks': self.mark_pool.stats(),
+        }
+
+    def lock_stats(self):
+        """
+        Sum the contention counters of every lock of the match.
+
+        Returns:
+            dict: number of acquisitions that had to wait and total wait time in milliseconds
+        """
+        locks = [self.lock, *self.grid.locks()]
+        return {
+            'waits': sum(lock.waits for lock in locks),
+            'wait_ms': sum(lock.wait_time for lock in locks) * 1000,
+        }